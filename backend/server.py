@@ -1,28 +1,362 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
+from fastapi.encoders import jsonable_encoder
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, RedirectResponse, Response, StreamingResponse
 import os
 import logging
 from pathlib import Path
+from urllib.parse import urlsplit
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, get_args
 import uuid
-from datetime import datetime
-import requests
+from datetime import datetime, timedelta
 from cryptography.fernet import Fernet
 import json
 import asyncio
+import base64
+import bisect
+import collections
+import cProfile
+import functools
+import gzip
+import hashlib
+import heapq
+import hmac
+import ipaddress
+import itertools
+import marshal
+import math
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
 
+try:
+    import brotli
+except ImportError:  # optional: responses fall back to gzip
+    brotli = None
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Metrics
+# Minimal Prometheus text-format registry. Metrics are plain dicts keyed by
+# label tuples behind a lock, since Motor runs command listeners on its
+# executor threads rather than on the event loop.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_labels(labelnames, labelvalues) -> str:
+    if not labelnames:
+        return ""
+    pairs = []
+    for name, value in zip(labelnames, labelvalues):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        metrics_registry.register(self)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = list(self._values.items())
+        for labelvalues, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {value}")
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labelvalues, amount: float = 1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues) -> float:
+        return self._values.get(labelvalues, 0)
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def inc(self, *labelvalues, amount: float = 1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues, amount: float = 1):
+        self.inc(*labelvalues, amount=-amount)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labelvalues)
+            if series is None:
+                series = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = [(labels, (list(s[0]), s[1], s[2])) for labels, s in self._values.items()]
+        labelnames = self.labelnames + ("le",)
+        for labelvalues, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                labels = _format_labels(labelnames, labelvalues + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric):
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+metrics_registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served", ("method",))
+MONGO_OPERATION_DURATION = Histogram(
+    "mongo_operation_duration_seconds", "MongoDB command latency", ("collection", "operation")
+)
+MONGO_OPERATION_ERRORS = Counter("mongo_operation_errors_total", "Failed MongoDB commands", ("collection", "operation"))
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "upstream_request_duration_seconds", "Upstream connector call latency", ("connector", "operation")
+)
+UPSTREAM_REQUEST_ERRORS = Counter("upstream_request_errors_total", "Failed upstream connector calls", ("connector", "operation"))
+CACHE_REQUESTS = Counter("cache_requests_total", "In-memory cache lookups", ("cache", "result"))
+CACHE_HIT_RATIO = Gauge("cache_hit_ratio", "Cache hit ratio since process start", ("cache",))
+EVENT_LOOP_LAG = Gauge("event_loop_lag_seconds", "Most recent event loop scheduling delay")
+EVENT_LOOP_LAG_HISTOGRAM = Histogram("event_loop_lag_distribution_seconds", "Event loop scheduling delay")
+
+EVENT_LOOP_LAG_INTERVAL = 0.5
+UNTRACKED_MONGO_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "endSessions", "saslStart", "saslContinue"}
+
+class MongoCommandMetrics:
+    """Record per-collection MongoDB command timings"""
+
+    def __init__(self):
+        self._pending: Dict[tuple, str] = {}
+
+    def started(self, event):
+        if event.command_name in UNTRACKED_MONGO_COMMANDS:
+            return
+        target = event.command.get(event.command_name)
+        if not isinstance(target, str):
+            target = event.command.get("collection", "")
+        self._pending[(event.connection_id, event.request_id)] = target
+
+    def _finish(self, event) -> Optional[str]:
+        return self._pending.pop((event.connection_id, event.request_id), None)
+
+    def succeeded(self, event):
+        collection = self._finish(event)
+        if collection is not None:
+            MONGO_OPERATION_DURATION.observe(event.duration_micros / 1e6, collection, event.command_name)
+            record_request_time("mongo", event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection = self._finish(event)
+        if collection is not None:
+            MONGO_OPERATION_DURATION.observe(event.duration_micros / 1e6, collection, event.command_name)
+            MONGO_OPERATION_ERRORS.inc(collection, event.command_name)
+            record_request_time("mongo", event.duration_micros / 1e6)
+
+def mongo_command_listener():
+    """Bind MongoCommandMetrics to pymongo's listener base, importing pymongo on first use"""
+    from pymongo import monitoring
+
+    listener_class = type("MongoCommandListener", (MongoCommandMetrics, monitoring.CommandListener), {})
+    return listener_class()
+
+# Per-request time breakdown. ProfilingMiddleware installs a RequestTimings
+# for the request it captures; Mongo commands, upstream calls, Fernet
+# operations and explicit model validation add their elapsed time to it.
+# motor and asyncio.to_thread run executor work in a copy of the calling
+# context, so time spent on worker threads is charged to the right request.
+class RequestTimings:
+    """Seconds and call counts per category for one request"""
+
+    def __init__(self):
+        self.seconds: collections.Counter = collections.Counter()
+        self.calls: collections.Counter = collections.Counter()
+        self._lock = threading.Lock()
+
+    def add(self, category: str, seconds: float):
+        with self._lock:
+            self.seconds[category] += seconds
+            self.calls[category] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                category: {"seconds": round(self.seconds[category], 6), "calls": self.calls[category]}
+                for category in sorted(self.seconds)
+            }
+
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def record_request_time(category: str, seconds: float):
+    timings = request_timings.get()
+    if timings is not None:
+        timings.add(category, seconds)
+
+@contextmanager
+def track_request_time(category: str):
+    """Charge the enclosed block to the current request's breakdown, if one is being captured"""
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(category, time.perf_counter() - start)
+
+@contextmanager
+def track_upstream(connector: str, operation: str):
+    """Time an upstream call and count it as an error if it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_REQUEST_ERRORS.inc(connector, operation)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        UPSTREAM_REQUEST_DURATION.observe(elapsed, connector, operation)
+        record_request_time(f"upstream:{connector}", elapsed)
+
+def record_cache_lookup(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+def update_cache_hit_ratios():
+    caches = {labels[0] for labels in list(CACHE_REQUESTS._values)}
+    for cache in caches:
+        hits = CACHE_REQUESTS.value(cache, "hit")
+        total = hits + CACHE_REQUESTS.value(cache, "miss")
+        CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache)
+
+async def monitor_event_loop_lag():
+    """Measure how late the loop wakes up from a fixed sleep"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(EVENT_LOOP_LAG_INTERVAL)
+        lag = max(0.0, loop.time() - start - EVENT_LOOP_LAG_INTERVAL)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by matched route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc(method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec(method)
+            route = scope.get("route")
+            route_path = route.path_format if route is not None else "unmatched"
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, method, route_path, status_code)
+
 # MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# The Motor client, and the pymongo import behind it, is created on first use
+# so importing this module stays cheap; `db` forwards collection access to it.
+class MongoConnection:
+    def __init__(self, url: str, db_name: str):
+        self.url = url
+        self.db_name = db_name
+        self._client = None
+        self._database = None
+
+    @property
+    def database(self):
+        if self._database is None:
+            from motor.motor_asyncio import AsyncIOMotorClient
+
+            self._client = AsyncIOMotorClient(self.url, event_listeners=[mongo_command_listener()])
+            self._database = self._client[self.db_name]
+        return self._database
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+
+class LazyDatabase:
+    """Attribute/item proxy to the lazily connected database"""
+
+    def __init__(self, connection: MongoConnection):
+        self._connection = connection
+
+    def __getattr__(self, name: str):
+        return getattr(self._connection.database, name)
+
+    def __getitem__(self, name: str):
+        return self._connection.database[name]
+
+mongo = MongoConnection(os.environ['MONGO_URL'], os.environ['DB_NAME'])
+db = LazyDatabase(mongo)
 
 # Create the main app without a prefix
 app = FastAPI(title="Unified Security Console", version="1.0.0")
@@ -32,8 +366,13 @@ api_router = APIRouter(prefix="/api")
 
 # Security
 security = HTTPBearer()
-ENCRYPTION_KEY = os.environ.get('ENCRYPTION_KEY', Fernet.generate_key())
-cipher_suite = Fernet(ENCRYPTION_KEY)
+optional_security = HTTPBearer(auto_error=False)
+ENCRYPTION_KEY = os.environ.get('ENCRYPTION_KEY')
+
+@functools.lru_cache(maxsize=None)
+def get_cipher_suite() -> Fernet:
+    """Build the Fernet cipher on first use"""
+    return Fernet(ENCRYPTION_KEY or Fernet.generate_key())
 
 # DefectDojo Configuration
 DEFECTDOJO_URL = os.environ.get('DEFECTDOJO_URL', 'https://demo.defectdojo.org')
@@ -70,6 +409,7 @@ class Application(BaseModel):
     api_key: Optional[str] = None
     description: Optional[str] = None
     default_port: Optional[int] = None
+    version: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -106,6 +446,7 @@ class User(BaseModel):
     roles: List[str] = []
     module_access: List[ModuleType] = []
     is_admin: bool = False
+    version: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -118,14 +459,29 @@ class UserCreate(BaseModel):
     module_access: List[ModuleType] = []
     is_admin: bool = False
 
+class UserUpdate(BaseModel):
+    username: Optional[str] = None
+    email: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    roles: Optional[List[str]] = None
+    module_access: Optional[List[ModuleType]] = None
+    is_admin: Optional[bool] = None
+
 class Role(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
     description: Optional[str] = None
     permissions: List[str] = []
     defectdojo_id: Optional[int] = None
+    version: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class RoleUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    permissions: Optional[List[str]] = None
+
 class DefectDojoUser(BaseModel):
     username: str
     email: str
@@ -137,6 +493,178 @@ class DefectDojoRole(BaseModel):
     role_id: int
     product_id: Optional[int] = None
 
+# Response Compression
+# Responses are compressed with the best encoding the client accepts (br,
+# when the optional brotli package is installed, then gzip) once they
+# reach COMPRESSION_MIN_SIZE. Streamed responses are compressed chunk by
+# chunk with a sync flush so NDJSON consumers still see rows as they are
+# produced. Constant payloads are compressed once at startup at maximum
+# level and served as-is, which the middleware leaves untouched.
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_GZIP_LEVEL = 5
+COMPRESSION_BROTLI_QUALITY = 4
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml")
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+# Proxied bodies are passed through exactly as the upstream encoded them
+COMPRESSION_EXCLUDED_PREFIXES = ("/api/proxy/",)
+
+def negotiate_encoding(accept_encoding: Optional[str], available=SUPPORTED_ENCODINGS) -> Optional[str]:
+    """Pick the preferred encoding from an Accept-Encoding header"""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Strong ETag for an encoded representation: the coding appended inside the quotes"""
+    return f'{etag[:-1]}-{encoding}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against one ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+def open_compressor(encoding: str):
+    if encoding == "br":
+        return _BrotliStream(COMPRESSION_BROTLI_QUALITY)
+    return _GzipStream(COMPRESSION_GZIP_LEVEL)
+
+class CompressionMiddleware:
+    """ASGI middleware negotiating br/gzip for buffered and streamed responses"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(COMPRESSION_EXCLUDED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                start_message["headers"] = list(start_message.get("headers", []))
+                headers = MutableHeaders(scope=start_message)
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or start_message["status"] < 200
+                    or start_message["status"] in (204, 304)
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = open_compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if headers.get("etag", "").endswith('"') and not headers["etag"].startswith("W/"):
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                if more_body:
+                    if "content-length" in headers:
+                        del headers["Content-Length"]
+                    body = compressor.compress(body)
+                else:
+                    body = compressor.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+            body = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+class PrecompressedPayload:
+    """A constant JSON body held in identity, gzip and (optionally) brotli forms"""
+
+    def __init__(self, content: Any):
+        self.identity = json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.identity).hexdigest()[:32]}"'
+        self.encoded: Dict[str, bytes] = {}
+        # Below the threshold the encoding overhead outweighs the savings
+        if len(self.identity) >= COMPRESSION_MIN_SIZE:
+            self.encoded["gzip"] = gzip.compress(self.identity, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.encoded["br"] = brotli.compress(self.identity, quality=11)
+
+    def response(self, request: Request) -> Response:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"), tuple(self.encoded))
+        etag = encoded_etag(self.etag, encoding) if encoding else self.etag
+        headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+        if self.encoded:
+            headers["Vary"] = "Accept-Encoding"
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        body = self.identity
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            body = self.encoded[encoding]
+        return Response(content=body, media_type="application/json", headers=headers)
+
 # Application Templates
 APP_TEMPLATES = {
     AppType.DEFECTDOJO: {
@@ -212,11 +740,13 @@ APP_TEMPLATES = {
 }
 def encrypt_data(data: str) -> str:
     """Encrypt sensitive data"""
-    return cipher_suite.encrypt(data.encode()).decode()
+    with track_request_time("crypto"):
+        return get_cipher_suite().encrypt(data.encode()).decode()
 
 def decrypt_data(encrypted_data: str) -> str:
     """Decrypt sensitive data"""
-    return cipher_suite.decrypt(encrypted_data.encode()).decode()
+    with track_request_time("crypto"):
+        return get_cipher_suite().decrypt(encrypted_data.encode()).decode()
 
 async def get_defectdojo_headers():
     """Get headers for DefectDojo API requests"""
@@ -225,15 +755,30 @@ async def get_defectdojo_headers():
         "Content-Type": "application/json"
     }
 
+@functools.lru_cache(maxsize=None)
+def get_defectdojo_session():
+    """Shared keep-alive session for DefectDojo, created on first call"""
+    import requests
+
+    return requests.Session()
+
+async def defectdojo_request(operation: str, method: str, path: str, **kwargs):
+    """Run a blocking DefectDojo call on a worker thread so the event loop keeps serving"""
+    headers = await get_defectdojo_headers()
+    session = get_defectdojo_session()
+    url = path if path.startswith("http") else f"{DEFECTDOJO_URL}{path}"
+    with track_upstream("defectdojo", operation):
+        response = await asyncio.to_thread(session.request, method, url, headers=headers, **kwargs)
+        response.raise_for_status()
+    return response
+
 # DefectDojo API Integration
 class DefectDojoService:
     @staticmethod
     async def get_users():
         """Get all users from DefectDojo"""
-        headers = await get_defectdojo_headers()
         try:
-            response = requests.get(f"{DEFECTDOJO_URL}/api/v2/users/", headers=headers)
-            response.raise_for_status()
+            response = await defectdojo_request("get_users", "GET", "/api/v2/users/")
             return response.json()
         except Exception as e:
             logging.error(f"Error fetching DefectDojo users: {e}")
@@ -242,14 +787,11 @@ class DefectDojoService:
     @staticmethod
     async def create_user(user_data: DefectDojoUser):
         """Create a user in DefectDojo"""
-        headers = await get_defectdojo_headers()
         try:
-            response = requests.post(
-                f"{DEFECTDOJO_URL}/api/v2/users/",
-                json=user_data.dict(),
-                headers=headers
+            response = await defectdojo_request(
+                "create_user", "POST", "/api/v2/users/",
+                json=user_data.dict()
             )
-            response.raise_for_status()
             return response.json()
         except Exception as e:
             logging.error(f"Error creating DefectDojo user: {e}")
@@ -258,10 +800,8 @@ class DefectDojoService:
     @staticmethod
     async def get_roles():
         """Get all roles from DefectDojo"""
-        headers = await get_defectdojo_headers()
         try:
-            response = requests.get(f"{DEFECTDOJO_URL}/api/v2/roles/", headers=headers)
-            response.raise_for_status()
+            response = await defectdojo_request("get_roles", "GET", "/api/v2/roles/")
             return response.json()
         except Exception as e:
             logging.error(f"Error fetching DefectDojo roles: {e}")
@@ -270,42 +810,1170 @@ class DefectDojoService:
     @staticmethod
     async def assign_role(user_id: int, role_data: DefectDojoRole):
         """Assign a role to a user in DefectDojo"""
-        headers = await get_defectdojo_headers()
         try:
             # This would typically be a product membership or global role assignment
             # For now, implementing as a placeholder
-            response = requests.post(
-                f"{DEFECTDOJO_URL}/api/v2/global_roles/",
-                json={"user": user_id, "role": role_data.role_id},
-                headers=headers
+            response = await defectdojo_request(
+                "assign_role", "POST", "/api/v2/global_roles/",
+                json={"user": user_id, "role": role_data.role_id}
             )
-            response.raise_for_status()
             return response.json()
         except Exception as e:
             logging.error(f"Error assigning role in DefectDojo: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to assign role in DefectDojo: {str(e)}")
 
+# DefectDojo Findings Mirror
+# Findings changed since a stored high-water mark are pulled page by page,
+# bulk-upserted into the local `findings` collection, and folded into
+# `findings_rollups` as per-bucket count deltas, so dashboards read a few
+# pre-aggregated documents instead of paging the upstream API. A lease in
+# `sync_state`, renewed after every page, keeps concurrent workers from
+# double-counting deltas. Pages are fetched by keyset on (changed, id) rather
+# than by following offset links, so findings that change mid-run cannot
+# shift the window and be skipped.
+# FINDINGS_CHANGED_FIELD must be set whenever a finding changes in a way the
+# console stores. Findings where it is null can never pass a `__gte` filter,
+# so they are excluded from the keyset pass and picked up by a second pass
+# keyed on id alone: each one is mirrored once, and again only after the
+# field gets a value.
+FINDINGS_SYNC_INTERVAL = float(os.environ.get('FINDINGS_SYNC_INTERVAL', '0'))
+FINDINGS_PAGE_SIZE = int(os.environ.get('FINDINGS_PAGE_SIZE', '500'))
+FINDINGS_CHANGED_FIELD = os.environ.get('FINDINGS_CHANGED_FIELD', 'last_status_update')
+FINDINGS_CHANGED_SINCE_PARAM = os.environ.get('FINDINGS_CHANGED_SINCE_PARAM', f'{FINDINGS_CHANGED_FIELD}__gte')
+FINDINGS_ORDERING = os.environ.get('FINDINGS_ORDERING', f'{FINDINGS_CHANGED_FIELD},id')
+FINDINGS_CHANGED_ISNULL_PARAM = os.environ.get('FINDINGS_CHANGED_ISNULL_PARAM', f'{FINDINGS_CHANGED_FIELD}__isnull')
+FINDINGS_ID_AFTER_PARAM = os.environ.get('FINDINGS_ID_AFTER_PARAM', 'id__gt')
+FINDINGS_SYNC_LEASE_SECONDS = 600
+FINDINGS_STATE_ID = "defectdojo_findings"
+FINDINGS_EXPORT_BATCH = 500
+FINDING_DIMENSIONS = ("severity", "product", "status")
+SEVERITY_ORDER = ["Critical", "High", "Medium", "Low", "Info"]
+
+FINDINGS_MIRRORED = Counter("findings_mirrored_total", "Findings upserted by the DefectDojo mirror")
+
+def finding_status(finding: Dict[str, Any]) -> str:
+    """Collapse DefectDojo's finding flags into a single status"""
+    if finding.get("is_mitigated"):
+        return "mitigated"
+    if finding.get("false_p"):
+        return "false_positive"
+    if finding.get("risk_accepted"):
+        return "risk_accepted"
+    if finding.get("duplicate"):
+        return "duplicate"
+    if finding.get("active"):
+        return "active"
+    return "inactive"
+
+def mirror_finding(finding: Dict[str, Any], mirrored_at: datetime) -> Dict[str, Any]:
+    """Project an upstream finding onto the fields the console stores"""
+    product = (((finding.get("related_fields") or {}).get("test") or {}).get("engagement") or {}).get("product") or {}
+    return {
+        "id": finding["id"],
+        "title": finding.get("title"),
+        "severity": finding.get("severity") or "Info",
+        "numerical_severity": finding.get("numerical_severity"),
+        "status": finding_status(finding),
+        "active": bool(finding.get("active")),
+        "verified": bool(finding.get("verified")),
+        "product_id": product.get("id"),
+        "product_name": product.get("name"),
+        "test_id": finding.get("test"),
+        "cwe": finding.get("cwe"),
+        "date": finding.get("date"),
+        "changed_at": finding.get(FINDINGS_CHANGED_FIELD),
+        "mirrored_at": mirrored_at
+    }
+
+def finding_buckets(finding: Dict[str, Any]) -> List[tuple]:
+    """Rollup buckets as (dimension, value, label) for one mirrored finding"""
+    return [
+        ("severity", finding.get("severity"), finding.get("severity")),
+        ("product", finding.get("product_id"), finding.get("product_name")),
+        ("status", finding.get("status"), finding.get("status"))
+    ]
+
+class FindingsMirror:
+    """Incremental DefectDojo findings sync with delta-maintained rollups"""
+
+    def __init__(self):
+        self.owner = str(uuid.uuid4())
+
+    async def _acquire_lease(self) -> bool:
+        now = datetime.utcnow()
+        try:
+            await db.sync_state.update_one(
+                {"_id": FINDINGS_STATE_ID, "$or": [{"lease_until": {"$lt": now}}, {"lease_until": None}]},
+                {"$set": {"lease_until": now + timedelta(seconds=FINDINGS_SYNC_LEASE_SECONDS), "lease_owner": self.owner}},
+                upsert=True
+            )
+        except Exception:
+            # Upsert collided with a document whose lease is still held
+            return False
+        state = await db.sync_state.find_one({"_id": FINDINGS_STATE_ID}, {"lease_owner": 1})
+        return bool(state) and state.get("lease_owner") == self.owner
+
+    async def _renew_lease(self):
+        result = await db.sync_state.update_one(
+            {"_id": FINDINGS_STATE_ID, "lease_owner": self.owner},
+            {"$set": {"lease_until": datetime.utcnow() + timedelta(seconds=FINDINGS_SYNC_LEASE_SECONDS)}}
+        )
+        if result.matched_count == 0:
+            raise HTTPException(status_code=409, detail="Findings sync lease was lost to another worker")
+
+    async def _release_lease(self, **fields):
+        await db.sync_state.update_one(
+            {"_id": FINDINGS_STATE_ID, "lease_owner": self.owner},
+            {"$set": {"lease_until": None, **fields}}
+        )
+
+    async def _apply_page(self, findings: List[Dict[str, Any]], mirrored_at: datetime) -> int:
+        from pymongo import UpdateOne
+
+        docs = [mirror_finding(finding, mirrored_at) for finding in findings]
+        previous = {
+            doc["id"]: doc
+            async for doc in db.findings.find(
+                {"id": {"$in": [doc["id"] for doc in docs]}},
+                {"_id": 0, "id": 1, "severity": 1, "product_id": 1, "product_name": 1, "status": 1}
+            )
+        }
+        deltas: Dict[tuple, int] = collections.Counter()
+        labels: Dict[tuple, Any] = {}
+        for doc in docs:
+            old = previous.get(doc["id"])
+            if old is not None:
+                for dimension, value, _ in finding_buckets(old):
+                    deltas[(dimension, value)] -= 1
+            for dimension, value, label in finding_buckets(doc):
+                deltas[(dimension, value)] += 1
+                labels[(dimension, value)] = label
+        
+        await db.findings.bulk_write(
+            [UpdateOne({"id": doc["id"]}, {"$set": doc}, upsert=True) for doc in docs],
+            ordered=False
+        )
+        rollup_ops = []
+        for (dimension, value), delta in deltas.items():
+            if not delta:
+                continue
+            update: Dict[str, Any] = {"$inc": {"count": delta}, "$setOnInsert": {"dimension": dimension, "value": value}}
+            if (dimension, value) in labels:
+                update["$set"] = {"label": labels[(dimension, value)]}
+            rollup_ops.append(UpdateOne({"_id": f"{dimension}:{value}"}, update, upsert=True))
+        if rollup_ops:
+            await db.findings_rollups.bulk_write(rollup_ops, ordered=False)
+        FINDINGS_MIRRORED.inc(amount=len(docs))
+        return len(docs)
+
+    async def _fetch_page(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        params = {"limit": FINDINGS_PAGE_SIZE, "related_fields": "true", **params}
+        response = await defectdojo_request("list_findings", "GET", "/api/v2/findings/", params=params)
+        return response.json().get("results", [])
+
+    async def _store_marks(self, **marks):
+        # Advance marks only after the page is stored, so a failed run resumes from here
+        await db.sync_state.update_one({"_id": FINDINGS_STATE_ID, "lease_owner": self.owner}, {"$set": marks})
+
+    async def _sync_unmarked(self, last_id: Optional[int], mirrored_at: datetime) -> int:
+        """Mirror findings whose changed field is null, by id keyset after the last one stored"""
+        mirrored = 0
+        while True:
+            params: Dict[str, Any] = {"offset": 0, "o": "id", FINDINGS_CHANGED_ISNULL_PARAM: "true"}
+            if last_id is not None:
+                params[FINDINGS_ID_AFTER_PARAM] = last_id
+            findings = await self._fetch_page(params)
+            # Also filtered here, so an upstream that ignores the id filter ends the pass instead of looping
+            fresh = [f for f in findings if last_id is None or f["id"] > last_id]
+            if fresh:
+                await self._renew_lease()
+                mirrored += await self._apply_page(fresh, mirrored_at)
+                last_id = fresh[-1]["id"]
+                await self._store_marks(null_high_water_id=last_id)
+            if len(findings) < FINDINGS_PAGE_SIZE or not fresh:
+                return mirrored
+
+    async def sync(self) -> Dict[str, Any]:
+        """Pull findings changed since the high-water mark; returns a run summary"""
+        if not await self._acquire_lease():
+            raise HTTPException(status_code=409, detail="A findings sync is already running")
+        
+        state = await db.sync_state.find_one({"_id": FINDINGS_STATE_ID}) or {}
+        # (changed, id) of the last stored finding; ties on changed are skipped up to id
+        high_water_mark = state.get("high_water_mark")
+        high_water_id = state.get("high_water_id")
+        
+        mirrored = 0
+        started_at = datetime.utcnow()
+        offset = 0
+        overlap_id = None
+        try:
+            while True:
+                params: Dict[str, Any] = {"offset": offset, "o": FINDINGS_ORDERING, FINDINGS_CHANGED_ISNULL_PARAM: "false"}
+                if high_water_mark:
+                    params[FINDINGS_CHANGED_SINCE_PARAM] = high_water_mark
+                findings = await self._fetch_page(params)
+                if offset and (not findings or findings[0]["id"] != overlap_id):
+                    # Rows left the tie being stepped through and shifted the window; restart it
+                    offset = 0
+                    continue
+                fresh = [
+                    f for f in findings
+                    if not (high_water_id is not None and f.get(FINDINGS_CHANGED_FIELD) == high_water_mark
+                            and f["id"] <= high_water_id)
+                ]
+                if fresh:
+                    await self._renew_lease()
+                    mirrored += await self._apply_page(fresh, started_at)
+                    if fresh[-1].get(FINDINGS_CHANGED_FIELD):
+                        high_water_mark = fresh[-1][FINDINGS_CHANGED_FIELD]
+                        high_water_id = fresh[-1]["id"]
+                        await self._store_marks(high_water_mark=high_water_mark, high_water_id=high_water_id)
+                if len(findings) < FINDINGS_PAGE_SIZE:
+                    break
+                if all(f.get(FINDINGS_CHANGED_FIELD) == high_water_mark for f in findings):
+                    # A full page inside one changed value would come back again from offset 0,
+                    # so step through the tie by offset, overlapping one row to detect shifts
+                    offset += len(findings) - 1
+                    overlap_id = findings[-1]["id"]
+                else:
+                    offset = 0
+            mirrored += await self._sync_unmarked(state.get("null_high_water_id"), started_at)
+        finally:
+            await self._release_lease(last_run=started_at, last_run_mirrored=mirrored)
+        
+        return {"mirrored": mirrored, "high_water_mark": high_water_mark, "started_at": started_at}
+
+    async def rebuild_rollups(self):
+        """Recompute all rollups from the local findings collection"""
+        from pymongo import ReplaceOne
+
+        ops = []
+        bucket_ids = []
+        for dimension, value_field, label_field in (
+            ("severity", "severity", "severity"),
+            ("product", "product_id", "product_name"),
+            ("status", "status", "status")
+        ):
+            pipeline = [{"$group": {"_id": f"${value_field}", "count": {"$sum": 1}, "label": {"$last": f"${label_field}"}}}]
+            async for bucket in db.findings.aggregate(pipeline):
+                bucket_ids.append(f"{dimension}:{bucket['_id']}")
+                ops.append(ReplaceOne(
+                    {"_id": bucket_ids[-1]},
+                    {"dimension": dimension, "value": bucket["_id"], "label": bucket["label"], "count": bucket["count"]},
+                    upsert=True
+                ))
+        if ops:
+            await db.findings_rollups.bulk_write(ops, ordered=False)
+        await db.findings_rollups.delete_many({"_id": {"$nin": bucket_ids}})
+
+    async def rollups(self, dimension: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        query = {"dimension": dimension, "count": {"$gt": 0}} if dimension else {"count": {"$gt": 0}}
+        result: Dict[str, List[Dict[str, Any]]] = {d: [] for d in ([dimension] if dimension else FINDING_DIMENSIONS)}
+        async for bucket in db.findings_rollups.find(query, {"_id": 0}):
+            result[bucket["dimension"]].append(bucket)
+        for buckets in result.values():
+            buckets.sort(key=lambda b: -b["count"])
+        if "severity" in result:
+            rank = {severity: i for i, severity in enumerate(SEVERITY_ORDER)}
+            result["severity"].sort(key=lambda b: rank.get(b["value"], len(rank)))
+        return result
+
+findings_mirror = FindingsMirror()
+
+async def run_findings_sync_loop():
+    """Mirror findings every FINDINGS_SYNC_INTERVAL seconds"""
+    while True:
+        try:
+            summary = await findings_mirror.sync()
+            logger.info(f"Mirrored {summary['mirrored']} DefectDojo findings")
+        except HTTPException as e:
+            logger.info(f"Skipped findings sync: {e.detail}")
+        except Exception as e:
+            logger.error(f"DefectDojo findings sync failed: {e}")
+        await asyncio.sleep(FINDINGS_SYNC_INTERVAL)
+
 # Authentication (simplified for MVP)
+ADMIN_TOKEN = "admin-token"
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current user from token (simplified implementation)"""
     # For MVP, we'll use a simple token check
     # In production, implement proper JWT validation
-    if credentials.credentials == "admin-token":
+    return resolve_token(credentials.credentials)
+
+def resolve_token(token: str) -> dict:
+    if token == ADMIN_TOKEN:
         return {"username": "admin", "is_admin": True}
     return {"username": "user", "is_admin": False}
 
+def resolve_scope_user(scope) -> Optional[dict]:
+    """Resolve a raw ASGI request's bearer token, for middleware that runs before dependencies"""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").strip().partition(" ")
+            if scheme.lower() == "bearer":
+                return resolve_token(token.strip())
+            return None
+    return None
+
+# Launcher Catalog
+# Launcher reads are served from an in-memory, module-indexed snapshot of the
+# applications collection instead of scanning Mongo per request. Writes in this
+# process invalidate it immediately; the TTL bounds staleness across workers.
+CATALOG_TTL_SECONDS = float(os.environ.get('CATALOG_TTL_SECONDS', '30'))
+
+LAUNCHER_FIELDS = ["id", "app_name", "app_type", "module", "redirect_url", "description"]
+ALL_MODULES_ORDERED = [module.value for module in ModuleType]
+ALL_MODULES = frozenset(ALL_MODULES_ORDERED)
+
+class ApplicationCatalog:
+    """Module- and id-indexed cache of launcher-visible application fields"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._by_module: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return bool(self._loaded_at) and time.monotonic() - self._loaded_at < self.ttl
+
+    async def _ensure_fresh(self):
+        if self._fresh():
+            record_cache_lookup("application_catalog", True)
+            return
+        record_cache_lookup("application_catalog", False)
+        async with self._lock:
+            if not self._fresh():
+                await self._load()
+
+    async def by_module(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return launcher entries grouped by module value"""
+        await self._ensure_fresh()
+        return self._by_module
+
+    async def get(self, app_id: str) -> Optional[Dict[str, Any]]:
+        """Return the launcher entry for an application id"""
+        await self._ensure_fresh()
+        app_doc = self._by_id.get(app_id)
+        if app_doc is None:
+            # Created by another worker since the last load
+            app_doc = await db.applications.find_one({"id": app_id}, self._projection())
+        return app_doc
+
+    @staticmethod
+    def _projection() -> Dict[str, int]:
+        projection = {field: 1 for field in LAUNCHER_FIELDS}
+        projection["_id"] = 0
+        return projection
+
+    async def _load(self):
+        by_module: Dict[str, List[Dict[str, Any]]] = {module.value: [] for module in ModuleType}
+        by_id: Dict[str, Dict[str, Any]] = {}
+        async for app_doc in db.applications.find({}, self._projection()):
+            by_module.setdefault(app_doc.get("module"), []).append(app_doc)
+            by_id[app_doc["id"]] = app_doc
+        self._by_module = by_module
+        self._by_id = by_id
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self._loaded_at = 0.0
+
+class ModuleAccessCache:
+    """Per-username cache of the module set a user may launch from"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, tuple] = {}
+
+    async def get(self, username: str) -> frozenset:
+        entry = self._entries.get(username)
+        if entry and time.monotonic() - entry[1] < self.ttl:
+            record_cache_lookup("module_access", True)
+            return entry[0]
+        record_cache_lookup("module_access", False)
+        user = await db.users.find_one(
+            {"username": username}, {"_id": 0, "module_access": 1, "is_admin": 1}
+        )
+        if not user:
+            modules = frozenset()
+        elif user.get("is_admin"):
+            modules = ALL_MODULES
+        else:
+            modules = frozenset(ModuleType(m).value for m in user.get("module_access", []))
+        self._entries[username] = (modules, time.monotonic())
+        return modules
+
+    def invalidate(self, username: Optional[str] = None):
+        if username is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(username, None)
+
+application_catalog = ApplicationCatalog(CATALOG_TTL_SECONDS)
+module_access_cache = ModuleAccessCache(CATALOG_TTL_SECONDS)
+
+async def get_module_access(current_user: dict) -> frozenset:
+    """Resolve the modules the caller may see"""
+    if current_user.get("is_admin"):
+        return ALL_MODULES
+    return await module_access_cache.get(current_user["username"])
+
+# Audit Log
+# Handlers only append events to an in-memory buffer; a background task
+# writes them with insert_many when AUDIT_BATCH_SIZE events are waiting or
+# every AUDIT_FLUSH_INTERVAL seconds, and the buffer is drained on shutdown.
+# The buffer is bounded, so a prolonged Mongo outage drops the oldest events
+# (counted in audit_events_dropped_total) instead of growing without limit.
+# Only transient failures are retried; events MongoDB rejects outright are
+# dropped and counted the same way.
+AUDIT_BATCH_SIZE = int(os.environ.get('AUDIT_BATCH_SIZE', '200'))
+AUDIT_FLUSH_INTERVAL = float(os.environ.get('AUDIT_FLUSH_INTERVAL', '1.0'))
+AUDIT_MAX_BUFFER = int(os.environ.get('AUDIT_MAX_BUFFER', '50000'))
+AUDIT_RETENTION_DAYS = int(os.environ.get('AUDIT_RETENTION_DAYS', '90'))
+
+# Per-document write errors worth retrying: the server was stepping down,
+# shutting down or timed out. Anything else (validation, document too large)
+# fails the same way on every attempt.
+AUDIT_RETRYABLE_WRITE_CODES = {6, 7, 89, 91, 189, 262, 9001, 10107, 11600, 11602, 13435, 13436}
+
+AUDIT_EVENTS = Counter("audit_events_total", "Audit events recorded", ("action",))
+AUDIT_EVENTS_DROPPED = Counter("audit_events_dropped_total", "Audit events dropped: buffer full or rejected by MongoDB")
+AUDIT_BUFFERED = Gauge("audit_events_buffered", "Audit events waiting to be flushed")
+
+class AuditLog:
+    """Buffered, batch-flushed writer for the audit_log collection"""
+
+    def __init__(self, batch_size: int, flush_interval: float, max_buffer: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: collections.deque = collections.deque(maxlen=max_buffer)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, actor: str, action: str, entity_type: str, entity_id: Optional[str] = None,
+               details: Optional[Dict[str, Any]] = None):
+        """Queue an audit event; never blocks or touches the database"""
+        if len(self._buffer) == self._buffer.maxlen:
+            AUDIT_EVENTS_DROPPED.inc()
+        self._buffer.append({
+            "id": str(uuid.uuid4()),
+            "timestamp": datetime.utcnow(),
+            "actor": actor,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "details": details or {}
+        })
+        AUDIT_EVENTS.inc(action)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Write all buffered events in batches"""
+        from pymongo.errors import BulkWriteError
+
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            try:
+                await db.audit_log.insert_many(batch, ordered=False)
+            except BulkWriteError as e:
+                # Documents without a write error were inserted, and duplicate-key
+                # errors mean an earlier attempt already wrote them. Rejected
+                # documents are dropped so they cannot block the buffer.
+                retry, rejected = [], 0
+                for error in e.details.get("writeErrors", []):
+                    if error.get("code") in AUDIT_RETRYABLE_WRITE_CODES:
+                        event = batch[error["index"]]
+                        event.pop("_id", None)
+                        retry.append(event)
+                    elif error.get("code") != 11000:
+                        rejected += 1
+                if rejected:
+                    AUDIT_EVENTS_DROPPED.inc(amount=rejected)
+                    logging.error(f"Dropped {rejected} of {len(batch)} audit events rejected by MongoDB: {e}")
+                if retry:
+                    logging.error(f"Failed to flush {len(retry)} of {len(batch)} audit events: {e}")
+                    self._requeue(retry)
+                    break
+            except Exception as e:
+                # Keep the _id pymongo assigned so a retry of anything that did
+                # reach the server fails as a duplicate instead of writing twice
+                logging.error(f"Failed to flush {len(batch)} audit events: {e}")
+                self._requeue(batch)
+                break
+            finally:
+                AUDIT_BUFFERED.set(len(self._buffer))
+
+    def _requeue(self, events: List[Dict[str, Any]]):
+        """Put failed events back at the head, dropping the oldest if the buffer is full"""
+        room = self._buffer.maxlen - len(self._buffer)
+        if len(events) > room:
+            AUDIT_EVENTS_DROPPED.inc(amount=len(events) - room)
+            events = events[len(events) - room:] if room else []
+        self._buffer.extendleft(reversed(events))
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+audit_log = AuditLog(AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL, AUDIT_MAX_BUFFER)
+
+# Launch Tracking
+# Launch counts are accumulated in memory and merged into launch_counters
+# with $inc every LAUNCH_FLUSH_INTERVAL seconds, so a launch never waits on
+# a database write and concurrent workers add up instead of overwriting.
+LAUNCH_FLUSH_INTERVAL = float(os.environ.get('LAUNCH_FLUSH_INTERVAL', '10'))
+
+APP_LAUNCHES = Counter("app_launches_total", "Application launches", ("app_type",))
+
+class LaunchCounters:
+    """Per-application launch counts awaiting a flush to launch_counters"""
+
+    def __init__(self):
+        self._pending: collections.Counter = collections.Counter()
+        self._last_launched: Dict[str, datetime] = {}
+
+    def record(self, app_doc: Dict[str, Any]):
+        self._pending[app_doc["id"]] += 1
+        self._last_launched[app_doc["id"]] = datetime.utcnow()
+        APP_LAUNCHES.inc(AppType(app_doc["app_type"]).value)
+
+    def pending(self, app_id: str) -> int:
+        return self._pending.get(app_id, 0)
+
+    async def flush(self):
+        """Merge pending counts into launch_counters in one bulk write"""
+        if not self._pending:
+            return
+        from pymongo import UpdateOne
+
+        pending, last_launched = self._pending, self._last_launched
+        self._pending, self._last_launched = collections.Counter(), {}
+        ops = [
+            UpdateOne(
+                {"_id": app_id},
+                {"$inc": {"count": count}, "$max": {"last_launched_at": last_launched[app_id]}},
+                upsert=True
+            )
+            for app_id, count in pending.items()
+        ]
+        try:
+            await db.launch_counters.bulk_write(ops, ordered=False)
+        except Exception as e:
+            logging.error(f"Failed to flush launch counters for {len(ops)} applications: {e}")
+            self._pending.update(pending)
+            for app_id, launched_at in last_launched.items():
+                self._last_launched[app_id] = max(launched_at, self._last_launched.get(app_id, launched_at))
+
+launch_counters = LaunchCounters()
+
+# Launch Tickets
+# Browser navigation cannot carry the bearer header, so tile clicks first
+# POST for a ticket: an HMAC-signed app id, user and expiry that the launch
+# redirect accepts once. Redemption is tracked per process, so across
+# workers a ticket is single-use only within its short TTL.
+LAUNCH_TICKET_TTL_SECONDS = int(os.environ.get('LAUNCH_TICKET_TTL_SECONDS', '30'))
+LAUNCH_TICKET_SECRET = os.environ.get('LAUNCH_TICKET_SECRET')
+
+_redeemed_launch_tickets: Dict[str, float] = {}
+
+@functools.lru_cache(maxsize=None)
+def get_launch_ticket_key() -> bytes:
+    """Signing key: LAUNCH_TICKET_SECRET, else derived from ENCRYPTION_KEY, else per process"""
+    secret = LAUNCH_TICKET_SECRET or ENCRYPTION_KEY
+    if secret:
+        return hashlib.sha256(b"launch-ticket:" + secret.encode()).digest()
+    return os.urandom(32)
+
+def _sign_launch_ticket(payload: bytes) -> str:
+    digest = hmac.new(get_launch_ticket_key(), payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+def issue_launch_ticket(app_id: str, current_user: dict) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({
+        "app_id": app_id,
+        "username": current_user["username"],
+        "is_admin": bool(current_user.get("is_admin")),
+        "exp": int(time.time()) + LAUNCH_TICKET_TTL_SECONDS,
+        "nonce": uuid.uuid4().hex
+    }).encode()).decode().rstrip("=")
+    return f"{payload}.{_sign_launch_ticket(payload.encode())}"
+
+def redeem_launch_ticket(ticket: str, app_id: str) -> Optional[dict]:
+    """Return the ticket's user if it is authentic, unexpired, unused and for this app"""
+    # Compare bytes: compare_digest rejects non-ASCII str, and tickets come from the query string
+    payload, _, signature = ticket.encode("utf-8", "surrogateescape").partition(b".")
+    if not hmac.compare_digest(signature, _sign_launch_ticket(payload).encode()):
+        return None
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload + b"=" * (-len(payload) % 4)))
+    except ValueError:
+        return None
+    now = time.time()
+    if claims.get("app_id") != app_id or claims.get("exp", 0) < now:
+        return None
+    if claims["nonce"] in _redeemed_launch_tickets:
+        return None
+    for nonce in [nonce for nonce, exp in _redeemed_launch_tickets.items() if exp < now]:
+        del _redeemed_launch_tickets[nonce]
+    _redeemed_launch_tickets[claims["nonce"]] = claims["exp"]
+    return {"username": claims["username"], "is_admin": claims["is_admin"]}
+
+async def get_launch_user(app_id: str, ticket: Optional[str] = None,
+                          credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)):
+    """Caller of a launch redirect, from the bearer header or a launch ticket"""
+    if credentials is not None:
+        return resolve_token(credentials.credentials)
+    if ticket:
+        current_user = redeem_launch_ticket(ticket, app_id)
+        if current_user is None:
+            raise HTTPException(status_code=403, detail="Invalid or expired launch ticket")
+        return current_user
+    raise HTTPException(status_code=403, detail="Not authenticated")
+
+async def run_launch_counter_flush_loop():
+    """Flush launch counters every LAUNCH_FLUSH_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(LAUNCH_FLUSH_INTERVAL)
+        await launch_counters.flush()
+
+def encode_audit_cursor(event: Dict[str, Any]) -> str:
+    raw = json.dumps([event["timestamp"].isoformat(), event["id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_audit_cursor(cursor: str) -> tuple:
+    try:
+        timestamp, event_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(timestamp), event_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# Search Index
+# Search and autocomplete are answered from an in-memory index over
+# applications, users and roles: a posting map of lowercased tokens plus
+# sorted token and title lists for prefix lookups via bisect. The index is
+# partitioned by type, and applications by module, so a caller's query only
+# visits the partitions it may see. Writes in this process update it in
+# place; a periodic background rebuild from Mongo picks up writes made by
+# other workers.
+SEARCH_REBUILD_INTERVAL = float(os.environ.get('SEARCH_REBUILD_INTERVAL', '300'))
+SEARCH_MAX_PREFIX_TOKENS = 2000
+# Documents scored per query; short prefixes on large catalogs stop here.
+# Candidates come from the most selective term only, so when every term
+# matches more than this many documents, documents containing all of them
+# can be cut off and the search returns fewer results, possibly none.
+SEARCH_MAX_CANDIDATES = int(os.environ.get('SEARCH_MAX_CANDIDATES', '2000'))
+SEARCH_REBUILD_CHUNK = 1000
+SEARCH_TOKEN_RE = re.compile(r"[a-z0-9]+")
+SEARCH_TYPES = ("application", "user", "role")
+SEARCH_FIELDS = {
+    "application": (("app_name", 3), ("description", 1)),
+    "user": (("username", 3), ("email", 2), ("first_name", 1), ("last_name", 1)),
+    "role": (("name", 3), ("description", 1))
+}
+SEARCH_TITLE_FIELDS = {"application": "app_name", "user": "username", "role": "name"}
+SEARCH_SUBTITLE_FIELDS = {"application": "module", "user": "email", "role": "description"}
+SEARCH_COLLECTIONS = {"application": "applications", "user": "users", "role": "roles"}
+PREFIX_END = "\uffff"
+
+def tokenize(text: str) -> List[str]:
+    return SEARCH_TOKEN_RE.findall(text.lower())
+
+def search_partition(entity_type: str, module: Optional[str]) -> tuple:
+    return (entity_type, module if entity_type == "application" else None)
+
+class SearchPartition:
+    """Postings and sorted prefix lists for one (type, module) slice of the index"""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[tuple, int]] = {}
+        self.tokens: List[str] = []
+        self.titles: List[tuple] = []
+
+    def add(self, entry: Dict[str, Any], keep_sorted: bool):
+        key = (entry["type"], entry["id"])
+        for token, weight in entry["tokens"].items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                if keep_sorted:
+                    bisect.insort(self.tokens, token)
+                else:
+                    self.tokens.append(token)
+            postings[key] = weight
+        if keep_sorted:
+            bisect.insort(self.titles, (entry["title_key"], key))
+        else:
+            self.titles.append((entry["title_key"], key))
+
+    def remove(self, entry: Dict[str, Any]):
+        key = (entry["type"], entry["id"])
+        for token in entry["tokens"]:
+            postings = self.postings[token]
+            postings.pop(key, None)
+            if not postings:
+                del self.postings[token]
+                del self.tokens[bisect.bisect_left(self.tokens, token)]
+        title_item = (entry["title_key"], key)
+        index = bisect.bisect_left(self.titles, title_item)
+        if index < len(self.titles) and self.titles[index] == title_item:
+            del self.titles[index]
+
+    def sort(self):
+        self.tokens.sort()
+        self.titles.sort()
+
+    def prefix_tokens(self, term: str):
+        start = bisect.bisect_left(self.tokens, term)
+        end = bisect.bisect_left(self.tokens, term + PREFIX_END)
+        return itertools.islice(self.tokens, start, min(end, start + SEARCH_MAX_PREFIX_TOKENS))
+
+    def prefix_titles(self, prefix: str):
+        start = bisect.bisect_left(self.titles, (prefix,))
+        end = bisect.bisect_left(self.titles, (prefix + PREFIX_END,))
+        return itertools.islice(self.titles, start, end)
+
+class SearchIndex:
+    """Partitioned token and title-prefix index for one snapshot of the searchable collections"""
+
+    def __init__(self):
+        self._docs: Dict[tuple, Dict[str, Any]] = {}
+        self._partitions: Dict[tuple, SearchPartition] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _entry(self, entity_type: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+        tokens: Dict[str, int] = {}
+        for field, weight in SEARCH_FIELDS[entity_type]:
+            for token in tokenize(str(doc.get(field) or "")):
+                if weight > tokens.get(token, 0):
+                    tokens[token] = weight
+        title = str(doc.get(SEARCH_TITLE_FIELDS[entity_type]) or "")
+        return {
+            "type": entity_type,
+            "id": doc["id"],
+            "title": title,
+            "title_key": title.lower(),
+            "subtitle": doc.get(SEARCH_SUBTITLE_FIELDS[entity_type]),
+            "partition": search_partition(entity_type, doc.get("module")),
+            "tokens": tokens
+        }
+
+    def _add(self, entry: Dict[str, Any], keep_sorted: bool):
+        self._docs[(entry["type"], entry["id"])] = entry
+        partition = self._partitions.get(entry["partition"])
+        if partition is None:
+            partition = self._partitions[entry["partition"]] = SearchPartition()
+        partition.add(entry, keep_sorted)
+
+    def bulk_load(self, entity_type: str, docs: List[Dict[str, Any]], sort: bool = True):
+        """Add many documents, sorting the prefix lists once at the end"""
+        for doc in docs:
+            self._add(self._entry(entity_type, doc), keep_sorted=False)
+        if sort:
+            self.sort()
+
+    def sort(self):
+        for partition in self._partitions.values():
+            partition.sort()
+
+    def upsert(self, entity_type: str, doc: Dict[str, Any]):
+        self.remove(entity_type, doc["id"])
+        self._add(self._entry(entity_type, doc), keep_sorted=True)
+
+    def remove(self, entity_type: str, doc_id: str):
+        entry = self._docs.pop((entity_type, doc_id), None)
+        if entry is not None:
+            self._partitions[entry["partition"]].remove(entry)
+
+    def _select(self, types, modules) -> List[SearchPartition]:
+        """Partitions of the given types, limited to `modules` for applications unless None"""
+        return [
+            partition for (entity_type, module), partition in self._partitions.items()
+            if entity_type in types and (modules is None or entity_type != "application" or module in modules)
+        ]
+
+    def _term_scores(self, term: str, partitions: List[SearchPartition]) -> Dict[tuple, int]:
+        """Score up to SEARCH_MAX_CANDIDATES documents containing `term` exactly (double weight), then as a prefix"""
+        scores: Dict[tuple, int] = {}
+        for partition in partitions:
+            for key, weight in partition.postings.get(term, {}).items():
+                if len(scores) >= SEARCH_MAX_CANDIDATES:
+                    return scores
+                scores[key] = weight * 2
+        for partition in partitions:
+            for token in partition.prefix_tokens(term):
+                if token == term:
+                    continue
+                for key, weight in partition.postings[token].items():
+                    if weight > scores.get(key, 0):
+                        if key not in scores and len(scores) >= SEARCH_MAX_CANDIDATES:
+                            return scores
+                        scores[key] = weight
+        return scores
+
+    @staticmethod
+    def _term_size(term: str, partitions: List[SearchPartition]) -> int:
+        """Posting entries matching `term` as a token or prefix"""
+        return sum(
+            len(partition.postings[token]) for partition in partitions for token in partition.prefix_tokens(term)
+        )
+
+    @staticmethod
+    def _entry_score(entry: Dict[str, Any], term: str) -> int:
+        return max(
+            (weight * (2 if token == term else 1) for token, weight in entry["tokens"].items() if token.startswith(term)),
+            default=0
+        )
+
+    def search(self, query: str, types, modules, limit: int) -> List[Dict[str, Any]]:
+        """Rank documents matching every query term, by field weight then title length"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        # The most selective term bounds the candidates; the others only rescore them
+        partitions = self._select(types, modules)
+        terms = sorted(terms, key=lambda term: (self._term_size(term, partitions), -len(term)))
+        scores = self._term_scores(terms[0], partitions)
+        for term in terms[1:]:
+            rescored = {}
+            for key, score in scores.items():
+                term_score = self._entry_score(self._docs[key], term)
+                if term_score:
+                    rescored[key] = score + term_score
+            scores = rescored
+            if not scores:
+                return []
+        ranked = heapq.nsmallest(
+            limit, ((-score, len(self._docs[key]["title"]), key) for key, score in scores.items())
+        )
+        return [self._result(self._docs[key], -neg_score) for neg_score, _, key in ranked]
+
+    def autocomplete(self, prefix: str, types, modules, limit: int) -> List[Dict[str, Any]]:
+        """Titles starting with `prefix` in order, then documents with a token starting with its last word"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        partitions = self._select(types, modules)
+        results: List[Dict[str, Any]] = []
+        seen = set()
+        titles = heapq.merge(*(partition.prefix_titles(prefix) for partition in partitions))
+        for _, key in itertools.islice(titles, limit):
+            results.append(self._result(self._docs[key], 2))
+            seen.add(key)
+        terms = tokenize(prefix)
+        if len(results) >= limit or not terms:
+            return results
+        for partition in partitions:
+            for token in partition.prefix_tokens(terms[-1]):
+                for key in partition.postings[token]:
+                    if key not in seen:
+                        results.append(self._result(self._docs[key], 1))
+                        seen.add(key)
+                        if len(results) >= limit:
+                            return results
+        return results
+
+    def _result(self, entry: Dict[str, Any], score: int) -> Dict[str, Any]:
+        return {
+            "type": entry["type"],
+            "id": entry["id"],
+            "title": entry["title"],
+            "subtitle": entry["subtitle"],
+            "score": score
+        }
+
+class SearchService:
+    """Holds the current SearchIndex and rebuilds it from Mongo when stale"""
+
+    def __init__(self, rebuild_interval: float):
+        self.rebuild_interval = rebuild_interval
+        self.index = SearchIndex()
+        self._loaded_at = 0.0
+        self._stale = False
+        self._lock = asyncio.Lock()
+        self._rebuild_task: Optional[asyncio.Task] = None
+        # Writes seen while a rebuild is reading Mongo, replayed onto the new index
+        self._pending: Optional[List[tuple]] = None
+
+    async def _rebuild(self):
+        self._pending = []
+        self._stale = False
+        try:
+            index = SearchIndex()
+            for entity_type in SEARCH_TYPES:
+                projection = {field: 1 for field, _ in SEARCH_FIELDS[entity_type]}
+                projection.update({"_id": 0, "id": 1, "module": 1, "email": 1})
+                cursor = db[SEARCH_COLLECTIONS[entity_type]].find({}, projection)
+                # Index in chunks, yielding between them so large rebuilds do not stall the loop
+                while True:
+                    docs = await cursor.to_list(SEARCH_REBUILD_CHUNK)
+                    if not docs:
+                        break
+                    index.bulk_load(entity_type, docs, sort=False)
+                    await asyncio.sleep(0)
+            index.sort()
+            for method, args in self._pending:
+                getattr(index, method)(*args)
+            self.index = index
+            self._loaded_at = time.monotonic()
+        finally:
+            self._pending = None
+
+    def upsert(self, entity_type: str, doc: Dict[str, Any]):
+        self.index.upsert(entity_type, doc)
+        if self._pending is not None:
+            self._pending.append(("upsert", (entity_type, doc)))
+
+    def remove(self, entity_type: str, doc_id: str):
+        self.index.remove(entity_type, doc_id)
+        if self._pending is not None:
+            self._pending.append(("remove", (entity_type, doc_id)))
+
+    async def get_index(self) -> SearchIndex:
+        """Return the index, loading it on first use and refreshing it in the background"""
+        if not self._loaded_at:
+            async with self._lock:
+                if not self._loaded_at:
+                    await self._rebuild()
+        elif self._stale or time.monotonic() - self._loaded_at > self.rebuild_interval:
+            if self._rebuild_task is None or self._rebuild_task.done():
+                self._rebuild_task = asyncio.create_task(self._rebuild())
+        return self.index
+
+    def invalidate(self):
+        """Force a rebuild on next use, after bulk writes that bypass upsert()"""
+        self._stale = True
+
+search_service = SearchService(SEARCH_REBUILD_INTERVAL)
+
+# Tool Proxy
+# /api/proxy/{app_id}/{path} forwards a request to a registered application
+# with its stored credentials attached according to the template auth_type.
+# Request and response bodies are streamed through a pooled keep-alive
+# httpx client without buffering, so memory stays constant regardless of
+# payload size and flow control propagates end to end. The stored
+# credentials are often administrative, so non-admins may only read:
+# GET/HEAD, plus POST to each tool's query endpoints.
+PROXY_MAX_CONNECTIONS = int(os.environ.get('PROXY_MAX_CONNECTIONS', '100'))
+PROXY_MAX_KEEPALIVE = int(os.environ.get('PROXY_MAX_KEEPALIVE', '20'))
+PROXY_CONNECT_TIMEOUT = float(os.environ.get('PROXY_CONNECT_TIMEOUT', '5'))
+PROXY_READ_TIMEOUT = float(os.environ.get('PROXY_READ_TIMEOUT', '300'))
+PROXY_VERIFY_TLS = os.environ.get('PROXY_VERIFY_TLS', '1') != '0'
+PROXY_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD"]
+PROXY_READ_METHODS = {"GET", "HEAD"}
+_SEARCH_API_QUERY_PATHS = re.compile(r"([^/]+/)?(_search|_msearch|_count|_mget)|_search/scroll")
+PROXY_QUERY_PATHS = {
+    AppType.OPENSEARCH: _SEARCH_API_QUERY_PATHS,
+    AppType.ELASTIC: _SEARCH_API_QUERY_PATHS,
+    AppType.THEHIVE: re.compile(r"api/(v1/)?query|api/(case|alert)/_search"),
+    AppType.CORTEX: re.compile(r"api/(analyzer|job)/_search"),
+    AppType.MISP: re.compile(r"(events|attributes)/restSearch")
+}
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailers",
+    "transfer-encoding", "upgrade", "host", "authorization", "cookie", "set-cookie"
+}
+API_KEY_HEADER_FORMATS = {
+    AppType.DEFECTDOJO: "Token {key}",
+    AppType.MISP: "{key}"
+}
+PROXY_APPLICATION_FIELDS = ["id", "app_type", "module", "redirect_url", "ip", "default_port", "username", "password", "api_key"]
+
+_proxy_client = None
+
+def get_proxy_client():
+    """Shared pooled httpx client, created on first proxied request"""
+    global _proxy_client
+    if _proxy_client is None:
+        import httpx
+
+        _proxy_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=PROXY_MAX_CONNECTIONS, max_keepalive_connections=PROXY_MAX_KEEPALIVE),
+            timeout=httpx.Timeout(PROXY_READ_TIMEOUT, connect=PROXY_CONNECT_TIMEOUT),
+            verify=PROXY_VERIFY_TLS,
+            follow_redirects=False
+        )
+    return _proxy_client
+
+async def close_proxy_client():
+    global _proxy_client
+    if _proxy_client is not None:
+        await _proxy_client.aclose()
+        _proxy_client = None
+
+def proxy_base_url(app_doc: Dict[str, Any]) -> str:
+    """Upstream origin: ip and port when configured, otherwise the redirect URL's origin"""
+    redirect = urlsplit(app_doc["redirect_url"])
+    scheme = redirect.scheme or "https"
+    if app_doc.get("ip"):
+        port = app_doc.get("default_port") or APP_TEMPLATES[AppType(app_doc["app_type"])]["default_port"]
+        return f"{scheme}://{app_doc['ip']}:{port}"
+    return f"{scheme}://{redirect.netloc}"
+
+def proxy_auth_headers(app_doc: Dict[str, Any]) -> Dict[str, str]:
+    """Upstream credentials for the application's template auth_type"""
+    app_type = AppType(app_doc["app_type"])
+    auth_type = APP_TEMPLATES[app_type]["auth_type"]
+    if auth_type == "basic" and app_doc.get("username"):
+        password = decrypt_data(app_doc["password"]) if app_doc.get("password") else ""
+        token = base64.b64encode(f"{app_doc['username']}:{password}".encode()).decode()
+        return {"Authorization": f"Basic {token}"}
+    if auth_type == "api_key" and app_doc.get("api_key"):
+        key_format = API_KEY_HEADER_FORMATS.get(app_type, "Bearer {key}")
+        return {"Authorization": key_format.format(key=decrypt_data(app_doc["api_key"]))}
+    return {}
+
+# Optimistic Concurrency
+# Applications, users and roles carry a version that every write increments
+# atomically. Clients may send it back as If-Match (the ETag) to make a write
+# conditional; documents written before versioning count as version 0.
+def version_etag(version: Optional[int]) -> str:
+    return f'"{version or 0}"'
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """Expected version from an If-Match header; None when absent or '*'"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    # ETags of compressed responses carry the coding, e.g. "3-gzip"
+    value = value.strip('"').split("-", 1)[0]
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be a quoted version number")
+
+def versioned_filter(entity_id: str, expected_version: Optional[int]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"id": entity_id}
+    if expected_version == 0:
+        query["version"] = {"$in": [0, None]}
+    elif expected_version is not None:
+        query["version"] = expected_version
+    return query
+
+def partial_update_fields(update: BaseModel, model: type) -> Dict[str, Any]:
+    """Fields set on a partial update, rejecting explicit nulls for fields the stored model requires"""
+    fields = update.dict(exclude_unset=True)
+    rejected = sorted(
+        name for name, value in fields.items()
+        if value is None and type(None) not in get_args(model.model_fields[name].annotation)
+    )
+    if rejected:
+        raise HTTPException(status_code=422, detail=f"{', '.join(rejected)} cannot be null")
+    return fields
+
+async def raise_write_failure(collection, entity_id: str, expected_version: Optional[int], label: str):
+    """Distinguish a missing document from a lost optimistic-concurrency race"""
+    if expected_version is not None and await collection.count_documents({"id": entity_id}, limit=1):
+        raise HTTPException(status_code=409, detail=f"{label} was modified by another request; reload and retry")
+    raise HTTPException(status_code=404, detail=f"{label} not found")
+
+async def versioned_update(collection, entity_id: str, fields: Dict[str, Any], if_match: Optional[str],
+                           label: str, touch: bool = True) -> Dict[str, Any]:
+    """Apply $set and bump the version in one round-trip, returning the updated document"""
+    from pymongo import ReturnDocument
+
+    expected_version = parse_if_match(if_match)
+    if touch:
+        fields = {**fields, "updated_at": datetime.utcnow()}
+    doc = await collection.find_one_and_update(
+        versioned_filter(entity_id, expected_version),
+        {"$set": fields, "$inc": {"version": 1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if doc is None:
+        await raise_write_failure(collection, entity_id, expected_version, label)
+    return doc
+
+async def versioned_delete(collection, entity_id: str, if_match: Optional[str], label: str,
+                           projection: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Delete in one round-trip, honouring If-Match, and return the removed document"""
+    expected_version = parse_if_match(if_match)
+    doc = await collection.find_one_and_delete(versioned_filter(entity_id, expected_version), projection=projection)
+    if doc is None:
+        await raise_write_failure(collection, entity_id, expected_version, label)
+    return doc
+
+def proxy_request_allowed(app_doc: Dict[str, Any], method: str, path: str, current_user: dict) -> bool:
+    """Admins may send anything; everyone else reads or queries"""
+    if current_user.get("is_admin") or method in PROXY_READ_METHODS:
+        return True
+    query_paths = PROXY_QUERY_PATHS.get(AppType(app_doc["app_type"]))
+    return method == "POST" and query_paths is not None and query_paths.fullmatch(path.strip("/")) is not None
+
 # Application Management Routes
 @api_router.get("/applications", response_model=List[Application])
 async def get_applications():
     """Get all applications"""
     apps = await db.applications.find().to_list(1000)
-    return [Application(**app) for app in apps]
+    with track_request_time("validation"):
+        return [Application(**app) for app in apps]
+
+@api_router.get("/applications/visible")
+async def get_visible_applications(current_user: dict = Depends(get_current_user)):
+    """Get launcher applications the caller has module access to, grouped by module"""
+    modules = await get_module_access(current_user)
+    catalog = await application_catalog.by_module()
+    visible = {module: catalog.get(module, []) for module in ALL_MODULES_ORDERED if module in modules}
+    return {
+        "modules": visible,
+        "total": sum(len(apps) for apps in visible.values())
+    }
+
+@api_router.get("/applications/launches")
+async def get_application_launches(current_user: dict = Depends(get_current_user)):
+    """Launch counts for applications the caller has module access to"""
+    modules = await get_module_access(current_user)
+    catalog = await application_catalog.by_module()
+    visible = {app_doc["id"]: app_doc for module in ALL_MODULES_ORDERED if module in modules
+               for app_doc in catalog.get(module, [])}
+    stored = {
+        doc["_id"]: doc
+        async for doc in db.launch_counters.find({"_id": {"$in": list(visible)}})
+    }
+    launches = []
+    for app_id, app_doc in visible.items():
+        doc = stored.get(app_id, {})
+        launches.append({
+            "app_id": app_id,
+            "app_name": app_doc["app_name"],
+            "module": app_doc["module"],
+            "count": doc.get("count", 0) + launch_counters.pending(app_id),
+            "last_launched_at": doc.get("last_launched_at")
+        })
+    launches.sort(key=lambda entry: entry["count"], reverse=True)
+    return {"launches": launches}
 
 @api_router.get("/applications/module/{module}")
 async def get_applications_by_module(module: ModuleType):
     """Get applications by module"""
     apps = await db.applications.find({"module": module}).to_list(1000)
-    return [Application(**app) for app in apps]
+    with track_request_time("validation"):
+        return [Application(**app) for app in apps]
 
 @api_router.post("/applications", response_model=Application)
 async def create_application(app_data: ApplicationCreate, current_user: dict = Depends(get_current_user)):
@@ -322,47 +1990,50 @@ async def create_application(app_data: ApplicationCreate, current_user: dict = D
     
     app_obj = Application(**app_dict)
     await db.applications.insert_one(app_obj.dict())
+    application_catalog.invalidate()
+    search_service.upsert("application", app_obj.dict())
+    audit_log.record(current_user["username"], "create", "application", app_obj.id, {"app_name": app_obj.app_name})
     return app_obj
 
 @api_router.put("/applications/{app_id}", response_model=Application)
-async def update_application(app_id: str, app_data: ApplicationUpdate, current_user: dict = Depends(get_current_user)):
+async def update_application(app_id: str, app_data: ApplicationUpdate, response: Response,
+                             current_user: dict = Depends(get_current_user),
+                             if_match: Optional[str] = Header(None)):
     """Update an application"""
     if not current_user.get("is_admin"):
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    # Get existing application
-    existing_app = await db.applications.find_one({"id": app_id})
-    if not existing_app:
-        raise HTTPException(status_code=404, detail="Application not found")
-    
     # Update fields
-    update_data = app_data.dict(exclude_unset=True)
+    update_data = partial_update_fields(app_data, Application)
     if update_data.get("password"):
         update_data["password"] = encrypt_data(update_data["password"])
     if update_data.get("api_key"):
         update_data["api_key"] = encrypt_data(update_data["api_key"])
     
-    update_data["updated_at"] = datetime.utcnow()
-    
-    await db.applications.update_one({"id": app_id}, {"$set": update_data})
-    updated_app = await db.applications.find_one({"id": app_id})
+    updated_app = await versioned_update(db.applications, app_id, update_data, if_match, "Application")
+    application_catalog.invalidate()
+    audit_log.record(current_user["username"], "update", "application", app_id, {"fields": sorted(update_data)})
+    search_service.upsert("application", updated_app)
+    response.headers["ETag"] = version_etag(updated_app["version"])
     return Application(**updated_app)
 
 @api_router.delete("/applications/{app_id}")
-async def delete_application(app_id: str, current_user: dict = Depends(get_current_user)):
+async def delete_application(app_id: str, current_user: dict = Depends(get_current_user),
+                             if_match: Optional[str] = Header(None)):
     """Delete an application"""
     if not current_user.get("is_admin"):
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    result = await db.applications.delete_one({"id": app_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Application not found")
+    await versioned_delete(db.applications, app_id, if_match, "Application", {"_id": 1})
+    application_catalog.invalidate()
+    search_service.remove("application", app_id)
+    audit_log.record(current_user["username"], "delete", "application", app_id)
     return {"message": "Application deleted successfully"}
 
 # Application Templates and Helper Routes
-@api_router.get("/app-templates")
-async def get_app_templates():
-    """Get available application templates"""
+@functools.lru_cache(maxsize=None)
+def get_app_template_payloads() -> Dict[Optional[AppType], PrecompressedPayload]:
+    """Precompressed template payloads: the summary under None, full templates by type"""
     templates = {}
     for app_type, template in APP_TEMPLATES.items():
         templates[app_type] = {
@@ -371,21 +2042,30 @@ async def get_app_templates():
             "description": template["description"],
             "auth_type": template["auth_type"]
         }
-    return templates
+    payloads = {None: PrecompressedPayload(templates)}
+    for app_type, template in APP_TEMPLATES.items():
+        payloads[app_type] = PrecompressedPayload(template)
+    return payloads
+
+@api_router.get("/app-templates")
+async def get_app_templates(request: Request):
+    """Get available application templates"""
+    return get_app_template_payloads()[None].response(request)
 
 @api_router.get("/app-templates/{app_type}")
-async def get_app_template(app_type: AppType):
+async def get_app_template(app_type: AppType, request: Request):
     """Get specific application template"""
     if app_type not in APP_TEMPLATES:
         raise HTTPException(status_code=404, detail="Template not found")
-    return APP_TEMPLATES[app_type]
+    return get_app_template_payloads()[app_type].response(request)
 
 # User Management Routes
 @api_router.get("/users", response_model=List[User])
 async def get_users():
     """Get all users"""
     users = await db.users.find().to_list(1000)
-    return [User(**user) for user in users]
+    with track_request_time("validation"):
+        return [User(**user) for user in users]
 
 @api_router.post("/users", response_model=User)
 async def create_user(user_data: UserCreate, current_user: dict = Depends(get_current_user)):
@@ -411,22 +2091,59 @@ async def create_user(user_data: UserCreate, current_user: dict = Depends(get_cu
     # Create user locally
     user_obj = User(**user_data.dict())
     await db.users.insert_one(user_obj.dict())
+    module_access_cache.invalidate(user_obj.username)
+    search_service.upsert("user", user_obj.dict())
+    audit_log.record(current_user["username"], "create", "user", user_obj.id, {"username": user_obj.username})
     return user_obj
 
 @api_router.get("/users/{user_id}", response_model=User)
-async def get_user(user_id: str):
+async def get_user(user_id: str, response: Response):
     """Get a specific user"""
     user = await db.users.find_one({"id": user_id})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    response.headers["ETag"] = version_etag(user.get("version"))
     return User(**user)
 
+@api_router.put("/users/{user_id}", response_model=User)
+async def update_user(user_id: str, user_data: UserUpdate, response: Response,
+                      current_user: dict = Depends(get_current_user),
+                      if_match: Optional[str] = Header(None)):
+    """Update a local user"""
+    if not current_user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    update_data = partial_update_fields(user_data, User)
+    updated_user = await versioned_update(db.users, user_id, update_data, if_match, "User")
+    if "username" in update_data:
+        module_access_cache.invalidate()
+    else:
+        module_access_cache.invalidate(updated_user["username"])
+    search_service.upsert("user", updated_user)
+    audit_log.record(current_user["username"], "update", "user", user_id, {"fields": sorted(update_data)})
+    response.headers["ETag"] = version_etag(updated_user["version"])
+    return User(**updated_user)
+
+@api_router.delete("/users/{user_id}")
+async def delete_user(user_id: str, current_user: dict = Depends(get_current_user),
+                      if_match: Optional[str] = Header(None)):
+    """Delete a local user"""
+    if not current_user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    deleted_user = await versioned_delete(db.users, user_id, if_match, "User", {"_id": 0, "username": 1})
+    module_access_cache.invalidate(deleted_user["username"])
+    search_service.remove("user", user_id)
+    audit_log.record(current_user["username"], "delete", "user", user_id, {"username": deleted_user["username"]})
+    return {"message": "User deleted successfully"}
+
 # Role Management Routes
 @api_router.get("/roles", response_model=List[Role])
 async def get_roles():
     """Get all roles"""
     roles = await db.roles.find().to_list(1000)
-    return [Role(**role) for role in roles]
+    with track_request_time("validation"):
+        return [Role(**role) for role in roles]
 
 @api_router.post("/roles", response_model=Role)
 async def create_role(role_data: Role, current_user: dict = Depends(get_current_user)):
@@ -435,8 +2152,37 @@ async def create_role(role_data: Role, current_user: dict = Depends(get_current_
         raise HTTPException(status_code=403, detail="Admin access required")
     
     await db.roles.insert_one(role_data.dict())
+    search_service.upsert("role", role_data.dict())
+    audit_log.record(current_user["username"], "create", "role", role_data.id, {"name": role_data.name})
     return role_data
 
+@api_router.put("/roles/{role_id}", response_model=Role)
+async def update_role(role_id: str, role_data: RoleUpdate, response: Response,
+                      current_user: dict = Depends(get_current_user),
+                      if_match: Optional[str] = Header(None)):
+    """Update a role"""
+    if not current_user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    update_data = partial_update_fields(role_data, Role)
+    updated_role = await versioned_update(db.roles, role_id, update_data, if_match, "Role", touch=False)
+    search_service.upsert("role", updated_role)
+    audit_log.record(current_user["username"], "update", "role", role_id, {"fields": sorted(update_data)})
+    response.headers["ETag"] = version_etag(updated_role["version"])
+    return Role(**updated_role)
+
+@api_router.delete("/roles/{role_id}")
+async def delete_role(role_id: str, current_user: dict = Depends(get_current_user),
+                      if_match: Optional[str] = Header(None)):
+    """Delete a role"""
+    if not current_user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    deleted_role = await versioned_delete(db.roles, role_id, if_match, "Role", {"_id": 0, "name": 1})
+    search_service.remove("role", role_id)
+    audit_log.record(current_user["username"], "delete", "role", role_id, {"name": deleted_role["name"]})
+    return {"message": "Role deleted successfully"}
+
 # DefectDojo Integration Routes
 @api_router.get("/defectdojo/users")
 async def get_defectdojo_users():
@@ -448,13 +2194,8 @@ async def get_defectdojo_roles():
     """Get roles from DefectDojo"""
     return await DefectDojoService.get_roles()
 
-@api_router.post("/defectdojo/sync-roles")
-async def sync_defectdojo_roles(current_user: dict = Depends(get_current_user)):
-    """Sync roles from DefectDojo to local database"""
-    if not current_user.get("is_admin"):
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    dojo_roles = await DefectDojoService.get_roles()
+async def store_defectdojo_roles(dojo_roles: Dict[str, Any], actor: str) -> int:
+    """Upsert a page of DefectDojo roles into the local collection"""
     synced_count = 0
     
     for role in dojo_roles.get("results", []):
@@ -465,39 +2206,479 @@ async def sync_defectdojo_roles(current_user: dict = Depends(get_current_user)):
             permissions=["read", "write"]  # Default permissions
         )
         
-        # Update or insert role
+        # Update or insert role, keeping the local id. The pipeline form compares
+        # against the stored values so the version only moves on a real change.
+        fields = role_obj.dict(exclude={"id", "version", "created_at"})
+        unchanged = {"$and": [{"$eq": [f"${name}", {"$literal": value}]} for name, value in fields.items()]}
+        current_version = {"$ifNull": ["$version", 0]}
         await db.roles.update_one(
             {"defectdojo_id": role.get("id")},
-            {"$set": role_obj.dict()},
+            [{"$set": {
+                **{name: {"$literal": value} for name, value in fields.items()},
+                "id": {"$ifNull": ["$id", {"$literal": role_obj.id}]},
+                "created_at": {"$ifNull": ["$created_at", {"$literal": role_obj.created_at}]},
+                "version": {"$cond": [unchanged, current_version, {"$add": [current_version, 1]}]}
+            }}],
             upsert=True
         )
         synced_count += 1
     
+    search_service.invalidate()
+    audit_log.record(actor, "sync", "role", details={
+        "source": "defectdojo",
+        "synced_count": synced_count
+    })
+    return synced_count
+
+@api_router.post("/defectdojo/sync-roles")
+async def sync_defectdojo_roles(current_user: dict = Depends(get_current_user)):
+    """Sync roles from DefectDojo to local database"""
+    if not current_user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    dojo_roles = await DefectDojoService.get_roles()
+    synced_count = await store_defectdojo_roles(dojo_roles, current_user.get("username", "system"))
     return {"message": f"Synced {synced_count} roles from DefectDojo"}
 
-# Dashboard Routes
-@api_router.get("/dashboard/stats")
-async def get_dashboard_stats():
-    """Get dashboard statistics"""
+# Findings Routes
+@api_router.post("/defectdojo/findings/sync")
+async def sync_defectdojo_findings(current_user: dict = Depends(get_current_user)):
+    """Incrementally mirror DefectDojo findings into the local collection"""
+    if not current_user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    summary = await findings_mirror.sync()
+    audit_log.record(current_user["username"], "sync", "finding", details={
+        "source": "defectdojo",
+        "synced_count": summary["mirrored"]
+    })
+    return summary
+
+@api_router.post("/findings/rollups/rebuild")
+async def rebuild_findings_rollups(current_user: dict = Depends(get_current_user)):
+    """Recompute findings rollups from the local mirror"""
+    if not current_user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    await findings_mirror.rebuild_rollups()
+    return {"message": "Findings rollups rebuilt"}
+
+@api_router.get("/findings/rollups")
+async def get_findings_rollups(dimension: Optional[str] = Query(None, pattern="^(severity|product|status)$"),
+                               current_user: dict = Depends(get_current_user)):
+    """Get pre-aggregated finding counts by severity, product and status"""
+    return await findings_mirror.rollups(dimension)
+
+@api_router.get("/findings/export")
+async def export_findings(
+    severity: Optional[str] = None,
+    status: Optional[str] = None,
+    product_id: Optional[int] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream all matching mirrored findings as NDJSON"""
+    query: Dict[str, Any] = {}
+    for field, value in (("severity", severity), ("status", status), ("product_id", product_id)):
+        if value is not None:
+            query[field] = value
+    
+    async def rows():
+        batch = []
+        async for finding in db.findings.find(query, {"_id": 0}).sort("id", 1):
+            batch.append(json.dumps(jsonable_encoder(finding)))
+            if len(batch) >= FINDINGS_EXPORT_BATCH:
+                yield "\n".join(batch) + "\n"
+                batch = []
+        if batch:
+            yield "\n".join(batch) + "\n"
+    
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+@api_router.get("/findings")
+async def get_findings(
+    severity: Optional[str] = None,
+    status: Optional[str] = None,
+    product_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get mirrored findings, paginated by ascending id"""
+    query: Dict[str, Any] = {}
+    for field, value in (("severity", severity), ("status", status), ("product_id", product_id)):
+        if value is not None:
+            query[field] = value
+    if after_id is not None:
+        query["id"] = {"$gt": after_id}
+    findings = await db.findings.find(query, {"_id": 0}).sort("id", 1).limit(limit).to_list(limit)
+    return {
+        "findings": findings,
+        "next_after_id": findings[-1]["id"] if len(findings) == limit else None
+    }
+
+# Launch Routes
+async def authorize_launch(app_id: str, current_user: dict) -> Dict[str, Any]:
+    app_doc = await application_catalog.get(app_id)
+    if not app_doc:
+        raise HTTPException(status_code=404, detail="Application not found")
+    if app_doc["module"] not in await get_module_access(current_user):
+        raise HTTPException(status_code=403, detail="No access to this application's module")
+    if not app_doc.get("redirect_url"):
+        raise HTTPException(status_code=404, detail="No redirect URL configured for this application")
+    return app_doc
+
+@api_router.post("/launch/{app_id}/ticket")
+async def create_launch_ticket(app_id: str, current_user: dict = Depends(get_current_user)):
+    """Issue a short-lived, single-use ticket for the launch redirect"""
+    await authorize_launch(app_id, current_user)
+    return {"ticket": issue_launch_ticket(app_id, current_user), "expires_in": LAUNCH_TICKET_TTL_SECONDS}
+
+@api_router.get("/launch/{app_id}")
+async def launch_application(app_id: str, current_user: dict = Depends(get_launch_user)):
+    """Redirect to an application's UI after a module access check"""
+    app_doc = await authorize_launch(app_id, current_user)
+    launch_counters.record(app_doc)
+    audit_log.record(current_user["username"], "launch", "application", app_id, {"app_name": app_doc["app_name"]})
+    return RedirectResponse(app_doc["redirect_url"], status_code=302, headers={"Cache-Control": "no-store"})
+
+# Proxy Routes
+@api_router.api_route("/proxy/{app_id}/{path:path}", methods=PROXY_METHODS)
+async def proxy_to_application(app_id: str, path: str, request: Request, current_user: dict = Depends(get_current_user)):
+    """Stream a request to a registered application using its stored credentials"""
+    app_doc = await db.applications.find_one(
+        {"id": app_id}, {field: 1 for field in PROXY_APPLICATION_FIELDS} | {"_id": 0}
+    )
+    if not app_doc:
+        raise HTTPException(status_code=404, detail="Application not found")
+    if app_doc["module"] not in await get_module_access(current_user):
+        raise HTTPException(status_code=403, detail="No access to this application's module")
+    if ".." in path.split("/"):
+        raise HTTPException(status_code=400, detail="Invalid proxy path")
+    if not proxy_request_allowed(app_doc, request.method, path, current_user):
+        raise HTTPException(status_code=403, detail="Only read and query requests are allowed for non-admin users")
+    
+    headers = [
+        (name, value) for name, value in request.headers.items() if name.lower() not in HOP_BY_HOP_HEADERS
+    ]
+    headers.extend(proxy_auth_headers(app_doc).items())
+    has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+    
+    client = get_proxy_client()
+    upstream_request = client.build_request(
+        request.method,
+        f"{proxy_base_url(app_doc)}/{path}",
+        params=request.query_params.multi_items(),
+        headers=headers,
+        content=request.stream() if has_body else None
+    )
+    try:
+        with track_upstream(f"proxy_{app_doc['app_type'].lower()}", request.method):
+            upstream_response = await client.send(upstream_request, stream=True)
+    except Exception as e:
+        logging.error(f"Proxy request to application {app_id} failed: {e}")
+        raise HTTPException(status_code=502, detail=f"Upstream request failed: {type(e).__name__}")
+    
+    response = StreamingResponse(
+        upstream_response.aiter_raw(),
+        status_code=upstream_response.status_code,
+        background=BackgroundTask(upstream_response.aclose)
+    )
+    # Raw pairs keep repeated headers (Link, Vary, ...) separate
+    response.raw_headers.extend(
+        (name, value) for name, value in upstream_response.headers.raw
+        if name.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS
+    )
+    return response
+
+# Search Routes
+@api_router.get("/search")
+async def search_entities(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = Query(None, description="Comma-separated subset of application,user,role"),
+    mode: str = Query("search", pattern="^(search|autocomplete)$"),
+    limit: int = Query(10, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    """Ranked search or title autocomplete; search scores at most SEARCH_MAX_CANDIDATES matches of the rarest term, so queries of only very common terms may return nothing"""
+    requested = set(types.split(",")) if types else set(SEARCH_TYPES)
+    if not requested <= set(SEARCH_TYPES):
+        raise HTTPException(status_code=400, detail=f"types must be a subset of {','.join(SEARCH_TYPES)}")
+    
+    # Non-admins only see applications in modules they can access
+    modules = None
+    if not current_user.get("is_admin"):
+        requested &= {"application"}
+        modules = await get_module_access(current_user)
+    
+    index = await search_service.get_index()
+    if mode == "autocomplete":
+        results = index.autocomplete(q, requested, modules, limit)
+    else:
+        results = index.search(q, requested, modules, limit)
+    return {"query": q, "mode": mode, "results": results}
+
+# Audit Routes
+@api_router.get("/audit")
+async def get_audit_events(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    actor: Optional[str] = None,
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get audit events newest first, paginated by an opaque cursor"""
+    if not current_user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    query: Dict[str, Any] = {}
+    for field, value in (("actor", actor), ("action", action), ("entity_type", entity_type), ("entity_id", entity_id)):
+        if value is not None:
+            query[field] = value
+    if cursor:
+        timestamp, event_id = decode_audit_cursor(cursor)
+        query["$or"] = [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "id": {"$lt": event_id}}
+        ]
+    
+    events = await db.audit_log.find(query, {"_id": 0}).sort(
+        [("timestamp", -1), ("id", -1)]
+    ).limit(limit + 1).to_list(limit + 1)
+    next_cursor = encode_audit_cursor(events[limit - 1]) if len(events) > limit else None
+    return {"events": events[:limit], "next_cursor": next_cursor}
+
+# Dashboard Statistics Snapshots
+# Every STATS_SNAPSHOT_INTERVAL seconds one worker (claimed through
+# sync_state) records the dashboard stats as a raw point and folds it into
+# hourly and daily buckets (sum/count/min/max/last per metric). Each
+# resolution expires on its own schedule, and range queries read whichever
+# resolution keeps the result to a few hundred points. An explicit resolution
+# finer than that is coarsened, and ranges too long even for daily buckets
+# are rejected.
+STATS_SNAPSHOT_INTERVAL = float(os.environ.get('STATS_SNAPSHOT_INTERVAL', '60'))
+STATS_RAW_RETENTION_DAYS = int(os.environ.get('STATS_RAW_RETENTION_DAYS', '2'))
+STATS_HOURLY_RETENTION_DAYS = int(os.environ.get('STATS_HOURLY_RETENTION_DAYS', '90'))
+STATS_DAILY_RETENTION_DAYS = int(os.environ.get('STATS_DAILY_RETENTION_DAYS', '1825'))
+STATS_HISTORY_MAX_POINTS = 500
+STATS_RESOLUTION_ORDER = ("raw", "hour", "day")
+STATS_RESOLUTIONS = {
+    "hour": (timedelta(hours=1), STATS_HOURLY_RETENTION_DAYS),
+    "day": (timedelta(days=1), STATS_DAILY_RETENTION_DAYS)
+}
+CONNECTOR_HEALTH_TIMEOUT = 5
+
+connector_health: Dict[str, Dict[str, Any]] = {}
+
+async def check_defectdojo_health() -> Dict[str, Any]:
+    """Probe DefectDojo with a minimal request and remember the result"""
+    start = time.perf_counter()
+    try:
+        await defectdojo_request("health", "GET", "/api/v2/users/", params={"limit": 1}, timeout=CONNECTOR_HEALTH_TIMEOUT)
+        connected = True
+    except Exception as e:
+        logging.warning(f"DefectDojo health check failed: {e}")
+        connected = False
+    health = {
+        "connected": connected,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        "checked_at": datetime.utcnow()
+    }
+    connector_health["defectdojo"] = health
+    return health
+
+async def collect_dashboard_stats() -> Dict[str, Any]:
+    """Current totals and per-module application counts"""
     app_count = await db.applications.count_documents({})
     user_count = await db.users.count_documents({})
     role_count = await db.roles.count_documents({})
     
-    # Count applications by module
-    module_stats = {}
-    for module in ModuleType:
-        count = await db.applications.count_documents({"module": module})
-        module_stats[module] = count
+    # Count applications by module in one pass
+    module_stats = {module.value: 0 for module in ModuleType}
+    async for bucket in db.applications.aggregate([{"$group": {"_id": "$module", "count": {"$sum": 1}}}]):
+        if bucket["_id"] in module_stats:
+            module_stats[bucket["_id"]] = bucket["count"]
     
     return {
         "total_applications": app_count,
         "total_users": user_count,
         "total_roles": role_count,
-        "module_stats": module_stats,
-        "defectdojo_connected": True,  # Add actual health check
+        "module_stats": module_stats
+    }
+
+def snapshot_metrics(stats: Dict[str, Any], health: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten stats and connector health into numeric series"""
+    metrics = {
+        "total_applications": stats["total_applications"],
+        "total_users": stats["total_users"],
+        "total_roles": stats["total_roles"],
+        "defectdojo_up": 1 if health["connected"] else 0,
+        "defectdojo_latency_ms": health["latency_ms"]
+    }
+    for module, count in stats["module_stats"].items():
+        metrics[f"applications_{module}"] = count
+    return metrics
+
+async def ensure_stats_collections():
+    """Create the raw snapshot collection (time-series where supported) and TTL indexes"""
+    raw_ttl = STATS_RAW_RETENTION_DAYS * 86400
+    if "stats_snapshots" not in await db.list_collection_names():
+        try:
+            await db.create_collection(
+                "stats_snapshots",
+                timeseries={"timeField": "timestamp", "granularity": "minutes"},
+                expireAfterSeconds=raw_ttl
+            )
+        except Exception as e:
+            logging.info(f"Time-series collections unavailable, using a TTL-indexed collection: {e}")
+            await db.stats_snapshots.create_index("timestamp", expireAfterSeconds=raw_ttl)
+    await db.stats_rollups.create_index([("resolution", 1), ("bucket_start", 1)])
+    await db.stats_rollups.create_index("expire_at", expireAfterSeconds=0)
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    if resolution == "day":
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+async def claim_snapshot_slot(timestamp: datetime) -> bool:
+    """Let only one worker record the snapshot for this interval"""
+    slot = int((timestamp - datetime(1970, 1, 1)).total_seconds() // STATS_SNAPSHOT_INTERVAL)
+    try:
+        await db.sync_state.update_one(
+            {"_id": "stats_snapshot", "last_slot": {"$lt": slot}},
+            {"$set": {"last_slot": slot}},
+            upsert=True
+        )
+        return True
+    except Exception:
+        # Another worker already claimed this slot
+        return False
+
+async def record_stats_snapshot(timestamp: Optional[datetime] = None) -> Optional[Dict[str, float]]:
+    """Store one raw snapshot and fold it into the hourly and daily buckets"""
+    from pymongo import UpdateOne
+
+    timestamp = timestamp or datetime.utcnow()
+    if not await claim_snapshot_slot(timestamp):
+        return None
+    stats = await collect_dashboard_stats()
+    health = await check_defectdojo_health()
+    metrics = snapshot_metrics(stats, health)
+    await db.stats_snapshots.insert_one({"timestamp": timestamp, "metrics": metrics})
+    
+    ops = []
+    for resolution, (width, retention_days) in STATS_RESOLUTIONS.items():
+        start = bucket_start(timestamp, resolution)
+        update: Dict[str, Any] = {
+            "$setOnInsert": {
+                "resolution": resolution,
+                "bucket_start": start,
+                "expire_at": start + width + timedelta(days=retention_days)
+            },
+            "$inc": {"samples": 1},
+            "$min": {},
+            "$max": {},
+            "$set": {}
+        }
+        for name, value in metrics.items():
+            update["$inc"][f"metrics.{name}.sum"] = value
+            update["$inc"][f"metrics.{name}.count"] = 1
+            update["$min"][f"metrics.{name}.min"] = value
+            update["$max"][f"metrics.{name}.max"] = value
+            update["$set"][f"metrics.{name}.last"] = value
+        ops.append(UpdateOne({"_id": f"{resolution}:{start.isoformat()}"}, update, upsert=True))
+    await db.stats_rollups.bulk_write(ops, ordered=False)
+    return metrics
+
+async def run_stats_snapshot_loop():
+    """Record a dashboard stats snapshot every STATS_SNAPSHOT_INTERVAL seconds"""
+    try:
+        await ensure_stats_collections()
+    except Exception as e:
+        logger.error(f"Failed to prepare stats collections: {e}")
+    while True:
+        try:
+            await record_stats_snapshot()
+        except Exception as e:
+            logger.error(f"Failed to record stats snapshot: {e}")
+        await asyncio.sleep(STATS_SNAPSHOT_INTERVAL)
+
+def choose_stats_resolution(start: datetime, end: datetime) -> str:
+    """Finest resolution whose point count over the range stays under the cap"""
+    span = (end - start).total_seconds()
+    if STATS_SNAPSHOT_INTERVAL > 0 and span / STATS_SNAPSHOT_INTERVAL <= STATS_HISTORY_MAX_POINTS:
+        return "raw"
+    if span / 3600 <= STATS_HISTORY_MAX_POINTS:
+        return "hour"
+    if span / 86400 <= STATS_HISTORY_MAX_POINTS:
+        return "day"
+    raise HTTPException(
+        status_code=400, detail=f"Range too long; at most {STATS_HISTORY_MAX_POINTS} days per request"
+    )
+
+# Dashboard Routes
+@api_router.get("/dashboard/stats")
+async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
+    """Get dashboard statistics, including findings counts, for authenticated callers"""
+    stats = await collect_dashboard_stats()
+    
+    # Findings come from the local mirror's rollups, never from DefectDojo directly
+    findings_by_severity = {
+        bucket["value"]: bucket["count"] for bucket in (await findings_mirror.rollups("severity"))["severity"]
+    }
+    
+    return {
+        **stats,
+        "findings_by_severity": findings_by_severity,
+        "defectdojo_connected": connector_health.get("defectdojo", {}).get("connected", True),
         "last_sync": datetime.utcnow()
     }
 
+@api_router.get("/dashboard/stats/history")
+async def get_dashboard_stats_history(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: str = Query("auto", pattern="^(auto|raw|hour|day)$"),
+    aggregate: str = Query("avg", pattern="^(avg|min|max|last)$"),
+    metrics: Optional[str] = Query(None, description="Comma-separated metric names; all when omitted")
+):
+    """Get dashboard statistics over time from pre-bucketed snapshots"""
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=1)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    # Never finer than the cap allows, even when asked for explicitly
+    coarsest = choose_stats_resolution(start, end)
+    if resolution == "auto" or STATS_RESOLUTION_ORDER.index(resolution) < STATS_RESOLUTION_ORDER.index(coarsest):
+        resolution = coarsest
+    wanted = set(metrics.split(",")) if metrics else None
+    
+    points = []
+    if resolution == "raw":
+        cursor = db.stats_snapshots.find(
+            {"timestamp": {"$gte": start, "$lt": end}}, {"_id": 0}
+        ).sort("timestamp", 1)
+        async for snapshot in cursor:
+            values = snapshot["metrics"]
+            if wanted is not None:
+                values = {name: value for name, value in values.items() if name in wanted}
+            points.append({"timestamp": snapshot["timestamp"], "values": values})
+    else:
+        cursor = db.stats_rollups.find(
+            {"resolution": resolution, "bucket_start": {"$gte": bucket_start(start, resolution), "$lt": end}},
+            {"_id": 0, "bucket_start": 1, "metrics": 1}
+        ).sort("bucket_start", 1)
+        async for bucket in cursor:
+            values = {}
+            for name, series in bucket["metrics"].items():
+                if wanted is not None and name not in wanted:
+                    continue
+                values[name] = series["sum"] / series["count"] if aggregate == "avg" else series[aggregate]
+            points.append({"timestamp": bucket["bucket_start"], "values": values})
+    
+    return {"resolution": resolution, "aggregate": aggregate, "start": start, "end": end, "points": points}
+
 # Health Check
 @api_router.get("/health")
 async def health_check():
@@ -508,9 +2689,444 @@ async def health_check():
         "version": "1.0.0"
     }
 
+@api_router.get("/ready")
+async def readiness_check():
+    """Readiness probe: startup initialization done and MongoDB reachable"""
+    checks = {"initialized": startup_state["initialized"], "mongo": False}
+    try:
+        await asyncio.wait_for(db.command("ping"), READINESS_TIMEOUT)
+        checks["mongo"] = True
+    except Exception as e:
+        logging.warning(f"Readiness ping failed: {e}")
+    ready = all(checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "checks": checks,
+            "defectdojo_synced": startup_state["defectdojo_synced"]
+        }
+    )
+
+# Request Profiling
+# Admins can capture a profile of a single request by sending an X-Profile
+# header ("timings" for the per-request Mongo/upstream/crypto/validation
+# breakdown only, "sample" for a folded-stack sampler, "cprofile" for a pstats
+# dump); PROFILE_SAMPLE_RATE additionally samples that fraction of all
+# requests. Every capture records the breakdown. The sampler and cProfile are
+# process-wide: they see the event-loop thread while it also serves every
+# other in-flight request, and worker threads doing other requests' Mongo and
+# upstream I/O, so their output is only request-specific on an otherwise idle
+# worker. Only one capture runs at a time, and with profiling off the
+# middleware only scans the request headers.
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_BUFFER_SIZE = int(os.environ.get('PROFILE_BUFFER_SIZE', '20'))
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', '0.005'))
+PROFILE_MODES = {"timings", "sample", "cprofile"}
+
+class StackSampler:
+    """Periodically fold the stacks of all threads into flamegraph counts"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.counts: collections.Counter = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> bytes:
+        self._stop.set()
+        self._thread.join()
+        lines = [f"{stack} {count}" for stack, count in self.counts.most_common()]
+        return ("\n".join(lines) + "\n").encode()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if thread_id not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.counts[";".join(reversed(stack))] += 1
+
+class ProfileStore:
+    """Bounded ring buffer of captured request profiles"""
+
+    def __init__(self, size: int):
+        self._records: collections.deque = collections.deque(maxlen=size)
+        self.active = False
+
+    def add(self, record: Dict[str, Any]):
+        self._records.append(record)
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [{k: v for k, v in record.items() if k != "data"} for record in reversed(self._records)]
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        for record in self._records:
+            if record["id"] == profile_id:
+                return record
+        return None
+
+profile_store = ProfileStore(PROFILE_BUFFER_SIZE)
+
+class ProfilingMiddleware:
+    """ASGI middleware capturing opt-in per-request profiles"""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _requested_mode(self, scope) -> Optional[str]:
+        mode = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                mode = value.decode().strip().lower()
+                break
+        if mode is not None and (resolve_scope_user(scope) or {}).get("is_admin"):
+            return mode if mode in PROFILE_MODES else "sample"
+        if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        mode = self._requested_mode(scope)
+        if mode is None or profile_store.active:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = str(uuid.uuid4())
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profile_store.active = True
+        timings = RequestTimings()
+        timings_token = request_timings.set(timings)
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        elif mode == "sample":
+            profiler = StackSampler(PROFILE_SAMPLE_INTERVAL)
+            profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if mode == "cprofile":
+                profiler.disable()
+                profiler.create_stats()
+                data = marshal.dumps(profiler.stats)
+            elif mode == "sample":
+                data = profiler.stop()
+            else:
+                data = None
+            request_timings.reset(timings_token)
+            profile_store.active = False
+            profile_store.add({
+                "id": profile_id,
+                "mode": mode,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "started_at": started_at,
+                "duration_seconds": time.perf_counter() - start,
+                "timings": timings.summary(),
+                "data": data
+            })
+
+@api_router.get("/admin/profiles")
+async def list_profiles(current_user: dict = Depends(get_current_user)):
+    """List captured request profiles, newest first, with each request's time breakdown"""
+    if not current_user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return profile_store.list()
+
+@api_router.get("/admin/profiles/{profile_id}")
+async def download_profile(profile_id: str, current_user: dict = Depends(get_current_user)):
+    """Download process-wide folded stacks (sample) or a pstats dump (cprofile); see "timings" for this request's own time"""
+    if not current_user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    record = profile_store.get(profile_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if record["data"] is None:
+        return {"id": record["id"], "timings": record["timings"]}
+    if record["mode"] == "cprofile":
+        media_type, filename = "application/octet-stream", f"{profile_id}.pstats"
+    else:
+        media_type, filename = "text/plain", f"{profile_id}.folded"
+    return Response(
+        content=record["data"],
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# Admission Control
+# Expensive, low-priority routes are matched against ADMISSION_RULES before
+# routing. Each policy caps concurrent requests, queues a bounded number of
+# waiters for at most queue_timeout seconds, and applies a per-client token
+# bucket. When the whole worker is overloaded, low-priority requests are
+# shed immediately. Routes without a rule (launcher reads, health, metrics)
+# are never limited here.
+ADMISSION_CONTROL_ENABLED = os.environ.get('ADMISSION_CONTROL', '1') != '0'
+ADMISSION_OVERLOAD_INFLIGHT = int(os.environ.get('ADMISSION_OVERLOAD_INFLIGHT', '256'))
+ADMISSION_MAX_CLIENT_BUCKETS = 10000
+# Ingress/load balancer addresses (comma-separated IPs or CIDRs). Behind them
+# every request arrives from the proxy, so non-admin quotas are keyed on the
+# nearest X-Forwarded-For hop that is not a trusted proxy. Leave empty when
+# clients connect directly or uvicorn already rewrites the client address
+# (--proxy-headers with --forwarded-allow-ips).
+ADMISSION_TRUSTED_PROXIES = [
+    ipaddress.ip_network(network.strip(), strict=False)
+    for network in os.environ.get('ADMISSION_TRUSTED_PROXIES', '').split(',') if network.strip()
+]
+# Sized so a bulk import of ~1000 records goes through in one burst
+ADMISSION_ADMIN_WRITE_RATE = float(os.environ.get('ADMISSION_ADMIN_WRITE_RATE', '100'))
+ADMISSION_ADMIN_WRITE_BURST = float(os.environ.get('ADMISSION_ADMIN_WRITE_BURST', '1000'))
+
+def is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in ADMISSION_TRUSTED_PROXIES)
+
+def forwarded_client_address(scope) -> Optional[str]:
+    """Peer address, or the nearest untrusted X-Forwarded-For hop when the peer is a trusted proxy"""
+    client = scope.get("client")
+    address = client[0] if client else None
+    if address is None or not ADMISSION_TRUSTED_PROXIES or not is_trusted_proxy(address):
+        return address
+    hops = []
+    for name, value in scope["headers"]:
+        if name == b"x-forwarded-for":
+            hops.extend(hop.strip() for hop in value.decode("latin-1").split(","))
+    # Walk right to left: hops before the first untrusted one could be spoofed by the client
+    for hop in reversed(hops):
+        if not hop:
+            continue
+        address = hop
+        if not is_trusted_proxy(hop):
+            break
+    return address
+
+class AdmissionPolicy:
+    def __init__(self, name: str, priority: str, max_concurrency: int, max_queue: int,
+                 queue_timeout: float, client_rate: float, client_burst: float):
+        self.name = name
+        self.priority = priority
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+
+ADMISSION_POLICIES = {
+    policy.name: policy for policy in (
+        AdmissionPolicy("defectdojo_sync", "low", max_concurrency=1, max_queue=2, queue_timeout=5.0,
+                        client_rate=0.1, client_burst=2),
+        AdmissionPolicy("defectdojo_read", "low", max_concurrency=4, max_queue=16, queue_timeout=2.0,
+                        client_rate=1.0, client_burst=5),
+        AdmissionPolicy("export", "low", max_concurrency=2, max_queue=4, queue_timeout=2.0,
+                        client_rate=0.2, client_burst=2),
+        AdmissionPolicy("admin_write", "normal", max_concurrency=16, max_queue=64, queue_timeout=5.0,
+                        client_rate=ADMISSION_ADMIN_WRITE_RATE, client_burst=ADMISSION_ADMIN_WRITE_BURST),
+        AdmissionPolicy("proxy", "low", max_concurrency=64, max_queue=128, queue_timeout=5.0,
+                        client_rate=20.0, client_burst=40),
+        AdmissionPolicy("search", "normal", max_concurrency=32, max_queue=64, queue_timeout=1.0,
+                        client_rate=20.0, client_burst=40)
+    )
+}
+
+# (methods or None for any, path regex, policy name); first match wins
+ADMISSION_RULES = [
+    ({"POST"}, re.compile(r"^/api/defectdojo/(sync-roles|findings/sync)$"), "defectdojo_sync"),
+    ({"GET"}, re.compile(r"^/api/defectdojo/(users|roles)$"), "defectdojo_read"),
+    ({"GET"}, re.compile(r"^/api/findings/export$"), "export"),
+    ({"POST", "PUT", "DELETE"}, re.compile(r"^/api/(applications|users|roles)(/[^/]+)?$"), "admin_write"),
+    ({"GET"}, re.compile(r"^/api/search$"), "search"),
+    (None, re.compile(r"^/api/proxy/"), "proxy")
+]
+
+ADMISSION_REJECTED = Counter("admission_rejected_total", "Requests rejected by admission control", ("policy", "reason"))
+ADMISSION_QUEUE_WAIT = Histogram("admission_queue_wait_seconds", "Time spent queued for admission", ("policy",))
+
+class ConcurrencyLimiter:
+    """Semaphore with a bounded FIFO wait queue and per-waiter deadlines"""
+
+    def __init__(self, limit: int, max_queue: int):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters: collections.deque = collections.deque()
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release() hands its slot straight to the waiter, so active is unchanged
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.active -= 1
+
+class TokenBuckets:
+    """Per-client token buckets for one policy"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, List[float]] = {}
+
+    def take(self, client: str) -> float:
+        """Consume a token; returns 0 on success, otherwise seconds until one is available"""
+        now = time.monotonic()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) >= ADMISSION_MAX_CLIENT_BUCKETS:
+                self._prune(now)
+            bucket = self._buckets[client] = [self.burst, now]
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / self.rate
+
+    def _prune(self, now: float):
+        refill_time = self.burst / self.rate
+        self._buckets = {
+            client: bucket for client, bucket in self._buckets.items() if now - bucket[1] < refill_time
+        }
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying ADMISSION_RULES before routing"""
+
+    def __init__(self, app):
+        self.app = app
+        self.in_flight = 0
+        self.limiters = {
+            name: ConcurrencyLimiter(policy.max_concurrency, policy.max_queue)
+            for name, policy in ADMISSION_POLICIES.items()
+        }
+        self.quotas = {
+            name: TokenBuckets(policy.client_rate, policy.client_burst)
+            for name, policy in ADMISSION_POLICIES.items()
+        }
+
+    def _policy(self, scope) -> Optional[AdmissionPolicy]:
+        method, path = scope["method"], scope["path"]
+        for methods, pattern, name in ADMISSION_RULES:
+            if (methods is None or method in methods) and pattern.match(path):
+                return ADMISSION_POLICIES[name]
+        return None
+
+    def _client(self, scope) -> str:
+        """Quota key: the resolved identity for admin tokens, otherwise the client address.
+
+        Any non-admin token is accepted, so keying on the raw header would let a
+        client dodge its quota by varying the token.
+        """
+        user = resolve_scope_user(scope)
+        if user and user.get("is_admin"):
+            return f"user:{user['username']}"
+        return f"ip:{forwarded_client_address(scope) or 'unknown'}"
+
+    async def _reject(self, scope, receive, send, policy: AdmissionPolicy, status_code: int,
+                      reason: str, retry_after: float):
+        ADMISSION_REJECTED.inc(policy.name, reason)
+        response = JSONResponse(
+            status_code=status_code,
+            content={"detail": f"Request rejected by admission control ({reason})"},
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ADMISSION_CONTROL_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        self.in_flight += 1
+        try:
+            policy = self._policy(scope)
+            if policy is None:
+                await self.app(scope, receive, send)
+                return
+            if policy.priority == "low" and self.in_flight > ADMISSION_OVERLOAD_INFLIGHT:
+                await self._reject(scope, receive, send, policy, 503, "overloaded", policy.queue_timeout)
+                return
+            wait = self.quotas[policy.name].take(self._client(scope))
+            if wait:
+                await self._reject(scope, receive, send, policy, 429, "client quota exceeded", wait)
+                return
+            limiter = self.limiters[policy.name]
+            start = time.perf_counter()
+            if not await limiter.acquire(policy.queue_timeout):
+                await self._reject(scope, receive, send, policy, 503, "queue full or deadline exceeded", policy.queue_timeout)
+                return
+            ADMISSION_QUEUE_WAIT.observe(time.perf_counter() - start, policy.name)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                limiter.release()
+        finally:
+            self.in_flight -= 1
+
+# Metrics Endpoint
+@api_router.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of process metrics"""
+    update_cache_hit_ratios()
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Include the router in the main app
 app.include_router(api_router)
 
+app.add_middleware(AdmissionControlMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -518,6 +3134,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 # Configure logging
 logging.basicConfig(
@@ -526,10 +3145,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database and sync roles"""
-    logger.info("Starting Unified Security Console...")
+# Long-running tasks started at startup and cancelled on shutdown
+background_tasks: List[asyncio.Task] = []
+
+# Startup
+# In "lazy" mode (the default) the worker starts serving immediately: index
+# creation and role seeding run in a background task gating /api/ready, and
+# the DefectDojo sync follows it. "eager" mode completes all of it before
+# the first request, as before.
+STARTUP_MODE = os.environ.get('STARTUP_MODE', 'lazy')
+READINESS_TIMEOUT = float(os.environ.get('READINESS_TIMEOUT', '2'))
+STARTUP_RETRY_MAX_DELAY = 30.0
+
+startup_state = {"initialized": False, "defectdojo_synced": False}
+
+async def initialize_database():
+    """Create indexes and seed default roles"""
+    # Indexes backing launcher lookups
+    await db.applications.create_index("module")
+    await db.users.create_index("username")
+    
+    # Audit log retention and cursor pagination
+    await db.audit_log.create_index("timestamp", expireAfterSeconds=AUDIT_RETENTION_DAYS * 86400)
+    await db.audit_log.create_index([("timestamp", -1), ("id", -1)])
+    for field in ("actor", "entity_type", "entity_id"):
+        await db.audit_log.create_index([(field, 1), ("timestamp", -1), ("id", -1)])
+    
+    # Findings mirror lookups and filters
+    await db.findings.create_index("id", unique=True)
+    for field in ("severity", "status", "product_id"):
+        await db.findings.create_index([(field, 1), ("id", 1)])
+    await db.findings_rollups.create_index("dimension")
     
     # Initialize default roles if none exist
     role_count = await db.roles.count_documents({})
@@ -544,14 +3190,58 @@ async def startup_event():
             await db.roles.insert_one(role.dict())
         
         logger.info("Initialized default roles")
-    
-    # Sync DefectDojo roles
+    startup_state["initialized"] = True
+
+async def sync_defectdojo_on_startup():
+    """Sync DefectDojo roles; failures are logged, not fatal"""
     try:
-        await sync_defectdojo_roles({"is_admin": True})
+        # Call DefectDojo directly: DefectDojoService.get_roles swallows errors,
+        # which would mark an unreachable DefectDojo as synced
+        response = await defectdojo_request("get_roles", "GET", "/api/v2/roles/")
+        await store_defectdojo_roles(response.json(), "system")
+        startup_state["defectdojo_synced"] = True
         logger.info("Synced DefectDojo roles on startup")
     except Exception as e:
         logger.error(f"Failed to sync DefectDojo roles on startup: {e}")
 
+async def run_deferred_startup():
+    """Initialize the database with backoff, then run non-critical work"""
+    delay = 0.5
+    while not startup_state["initialized"]:
+        try:
+            await initialize_database()
+        except Exception as e:
+            logger.error(f"Database initialization failed, retrying in {delay:.1f}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, STARTUP_RETRY_MAX_DELAY)
+    await sync_defectdojo_on_startup()
+
+@app.on_event("startup")
+async def startup_event():
+    """Initialize database and sync roles"""
+    logger.info(f"Starting Unified Security Console ({STARTUP_MODE} startup)...")
+    background_tasks.append(asyncio.create_task(monitor_event_loop_lag()))
+    audit_log.start()
+    get_app_template_payloads()
+    
+    if STARTUP_MODE == "eager":
+        await initialize_database()
+        await sync_defectdojo_on_startup()
+    else:
+        background_tasks.append(asyncio.create_task(run_deferred_startup()))
+    
+    if FINDINGS_SYNC_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(run_findings_sync_loop()))
+    if STATS_SNAPSHOT_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(run_stats_snapshot_loop()))
+    if LAUNCH_FLUSH_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(run_launch_counter_flush_loop()))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    for task in background_tasks:
+        task.cancel()
+    await audit_log.close()
+    await launch_counters.flush()
+    await close_proxy_client()
+    mongo.close()
@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+"""
+Offline load-test and benchmark suite for the Unified Security Console backend.
+
+Boots `server:app` under uvicorn in a subprocess against a local MongoDB (or an
+in-process mongomock stand-in with --in-memory) and a local fake DefectDojo
+server with configurable latency and error injection, drives a weighted
+request mix at a fixed concurrency and writes req/s and p50/p95/p99 per
+endpoint as JSON. Pass --compare with a previous report to flag regressions.
+
+With --cold-start N it instead spawns the server N times and reports the
+module import time, spawn-to-first-response on /api/health and
+spawn-to-ready on /api/ready.
+
+Admission control is disabled in the benchmarked server unless
+--admission-control is passed, so seeding and write-heavy mixes measure the
+handlers rather than the per-client quotas.
+
+Examples:
+    python backend_benchmark.py --in-memory --mix launcher --output before.json
+    python backend_benchmark.py --in-memory --mix mixed --compare before.json
+    python backend_benchmark.py --in-memory --cold-start 5
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode
+
+import requests
+
+ROOT_DIR = Path(__file__).parent
+BACKEND_DIR = ROOT_DIR / "backend"
+ADMIN_HEADERS = {"Authorization": "Bearer admin-token", "Content-Type": "application/json"}
+USER_HEADERS = {"Authorization": "Bearer user-token", "Content-Type": "application/json"}
+MODULES = ["XDR", "XDR+", "OXDR", "GSOS"]
+APP_TYPES = ["DefectDojo", "TheHive", "OpenSearch", "Wazuh", "Suricata", "Elastic", "Splunk", "MISP", "Cortex", "Custom"]
+
+SERVER_BOOTSTRAP = """
+import uvicorn
+if {in_memory}:
+    import motor.motor_asyncio
+    from mongomock_motor import AsyncMongoMockClient
+    motor.motor_asyncio.AsyncIOMotorClient = lambda url, **kwargs: AsyncMongoMockClient()
+uvicorn.run("server:app", host="127.0.0.1", port={port}, log_level="warning")
+"""
+
+
+IMPORT_PROBE = """
+import time
+start = time.perf_counter()
+import server
+print(time.perf_counter() - start)
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+class FakeDefectDojo:
+    """Threaded local stand-in for the DefectDojo v2 API"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 users: int = 50, roles: int = 5, findings: int = 2000, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.users = [
+            {"id": i, "username": f"dojo-user-{i}", "email": f"dojo-user-{i}@example.com",
+             "first_name": "Dojo", "last_name": f"User {i}"}
+            for i in range(1, users + 1)
+        ]
+        self.roles = [{"id": i, "name": f"Role {i}"} for i in range(1, roles + 1)]
+        severities = ["Critical", "High", "Medium", "Low", "Info"]
+        self.findings = [
+            {"id": i, "title": f"Finding {i}", "severity": severities[i % len(severities)],
+             "active": i % 3 != 0, "verified": i % 2 == 0, "is_mitigated": i % 3 == 0,
+             "false_p": False, "duplicate": False, "risk_accepted": False, "test": i % 40,
+             # Every tenth finding has never had a status change, like legacy DefectDojo rows
+             "last_status_update": None if i % 10 == 0 else f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z",
+             "related_fields": {"test": {"engagement": {"product": {"id": i % 7, "name": f"Product {i % 7}"}}}}}
+            for i in range(1, findings + 1)
+        ]
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler())
+        self._server.daemon_threads = True
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, status: int, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _inject(self) -> bool:
+                delay = fake.latency + fake.random.uniform(0, fake.jitter)
+                if delay:
+                    time.sleep(delay)
+                if fake.error_rate and fake.random.random() < fake.error_rate:
+                    self._respond(500, {"detail": "injected error"})
+                    return True
+                return False
+
+            def do_GET(self):
+                if self._inject():
+                    return
+                path, _, query = self.path.partition("?")
+                if path == "/api/v2/findings/":
+                    self._respond(200, fake.findings_page(parse_qs(query)))
+                elif path == "/api/v2/users/":
+                    self._respond(200, {"count": len(fake.users), "next": None, "results": fake.users})
+                elif path == "/api/v2/roles/":
+                    self._respond(200, {"count": len(fake.roles), "next": None, "results": fake.roles})
+                else:
+                    self._respond(404, {"detail": "Not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self._inject():
+                    return
+                path = self.path.split("?", 1)[0]
+                if path in ("/api/v2/users/", "/api/v2/global_roles/"):
+                    payload["id"] = fake.random.randint(1000, 10 ** 6)
+                    self._respond(201, payload)
+                else:
+                    self._respond(404, {"detail": "Not found"})
+
+        return Handler
+
+    def findings_page(self, query: dict) -> dict:
+        """Offset-paginated findings ordered by (last_status_update, id), filtered like DefectDojo's finding filters"""
+        since = query.get("last_status_update__gte", [""])[0]
+        after = int(query.get("id__gt", ["0"])[0])
+        if query.get("last_status_update__isnull", [""])[0] == "true":
+            matching = sorted((f for f in self.findings if f["last_status_update"] is None and f["id"] > after),
+                              key=lambda f: f["id"])
+        else:
+            matching = sorted((f for f in self.findings if f["last_status_update"] is not None
+                               and f["last_status_update"] >= since and f["id"] > after),
+                              key=lambda f: (f["last_status_update"], f["id"]))
+        limit = int(query.get("limit", ["100"])[0])
+        offset = int(query.get("offset", ["0"])[0])
+        next_url = None
+        if offset + limit < len(matching):
+            next_query = dict(query, offset=[str(offset + limit)], limit=[str(limit)])
+            next_url = f"{self.url}/api/v2/findings/?{urlencode(next_query, doseq=True)}"
+        return {"count": len(matching), "next": next_url, "results": matching[offset:offset + limit]}
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class ConsoleServer:
+    """uvicorn subprocess serving backend/server.py"""
+
+    def __init__(self, mongo_url: str, db_name: str, defectdojo_url: str, in_memory: bool,
+                 extra_env: dict = None, quiet: bool = True):
+        self.quiet = quiet
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.env = dict(os.environ)
+        self.env.update({
+            "MONGO_URL": mongo_url,
+            "DB_NAME": db_name,
+            "DEFECTDOJO_URL": defectdojo_url,
+            "DEFECTDOJO_API_KEY": "benchmark",
+        })
+        self.env.update(extra_env or {})
+        self.in_memory = in_memory
+        self.process = None
+        self.started_at = None
+
+    def start(self):
+        code = SERVER_BOOTSTRAP.format(in_memory=self.in_memory, port=self.port)
+        self.started_at = time.perf_counter()
+        output = subprocess.DEVNULL if self.quiet else None
+        self.process = subprocess.Popen([sys.executable, "-c", code], cwd=BACKEND_DIR, env=self.env,
+                                        stdout=output, stderr=output)
+
+    def wait_ready(self, path: str = "/api/health", timeout: float = 30.0) -> float:
+        """Poll until `path` answers 200; return seconds since process spawn"""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {self.process.returncode}")
+            try:
+                if requests.get(f"{self.url}{path}", timeout=1).status_code == 200:
+                    return time.perf_counter() - self.started_at
+            except requests.RequestException:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError(f"Server not ready on {path} after {timeout}s")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class Workload:
+    """Weighted request mixes against a seeded catalog"""
+
+    def __init__(self, base_url: str, seed: int):
+        self.api_url = f"{base_url}/api"
+        self.random = random.Random(seed)
+        self.app_ids = []
+        self.user_ids = []
+        self.lock = threading.Lock()
+
+    def seed(self, applications: int, users: int):
+        session = requests.Session()
+        for i in range(applications):
+            response = session.post(f"{self.api_url}/applications", headers=ADMIN_HEADERS, json={
+                "app_name": f"Bench App {i}",
+                "app_type": APP_TYPES[i % len(APP_TYPES)],
+                "module": MODULES[i % len(MODULES)],
+                "redirect_url": f"https://bench-{i}.example.com",
+                "description": f"Benchmark application {i}",
+            })
+            response.raise_for_status()
+            self.app_ids.append(response.json()["id"])
+        for i in range(users):
+            response = session.post(f"{self.api_url}/users", headers=ADMIN_HEADERS, json={
+                "username": "user" if i == 0 else f"bench-user-{i}",
+                "email": f"bench-user-{i}@example.com",
+                "module_access": MODULES[: 1 + i % len(MODULES)],
+            })
+            response.raise_for_status()
+            self.user_ids.append(response.json()["id"])
+
+    def _random_app(self, rng):
+        with self.lock:
+            return rng.choice(self.app_ids) if self.app_ids else None
+
+    # Each operation returns (method, path, headers, json body)
+    def op_visible(self, rng):
+        return "GET", "/applications/visible", USER_HEADERS, None
+
+    def op_module(self, rng):
+        return "GET", f"/applications/module/{rng.choice(MODULES)}", USER_HEADERS, None
+
+    def op_list_apps(self, rng):
+        return "GET", "/applications", ADMIN_HEADERS, None
+
+    def op_stats(self, rng):
+        return "GET", "/dashboard/stats", USER_HEADERS, None
+
+    def op_templates(self, rng):
+        return "GET", "/app-templates", USER_HEADERS, None
+
+    def op_list_users(self, rng):
+        return "GET", "/users", ADMIN_HEADERS, None
+
+    def op_list_roles(self, rng):
+        return "GET", "/roles", ADMIN_HEADERS, None
+
+    def op_create_app(self, rng):
+        return "POST", "/applications", ADMIN_HEADERS, {
+            "app_name": f"Bench App {uuid.uuid4().hex[:8]}",
+            "app_type": rng.choice(APP_TYPES),
+            "module": rng.choice(MODULES),
+            "redirect_url": "https://bench.example.com",
+        }
+
+    def op_update_app(self, rng):
+        app_id = self._random_app(rng)
+        return "PUT", f"/applications/{app_id}", ADMIN_HEADERS, {"description": f"updated {rng.random()}"}
+
+    def op_create_user(self, rng):
+        suffix = uuid.uuid4().hex[:8]
+        return "POST", "/users", ADMIN_HEADERS, {
+            "username": f"bench-{suffix}", "email": f"{suffix}@example.com", "module_access": ["XDR"]
+        }
+
+    def op_dojo_users(self, rng):
+        return "GET", "/defectdojo/users", ADMIN_HEADERS, None
+
+    def op_sync_roles(self, rng):
+        return "POST", "/defectdojo/sync-roles", ADMIN_HEADERS, None
+
+    def mix(self, name: str):
+        mixes = {
+            "launcher": [
+                (50, "GET /applications/visible", self.op_visible),
+                (20, "GET /applications/module/{module}", self.op_module),
+                (20, "GET /dashboard/stats", self.op_stats),
+                (10, "GET /app-templates", self.op_templates),
+            ],
+            "admin": [
+                (30, "GET /applications", self.op_list_apps),
+                (15, "GET /users", self.op_list_users),
+                (15, "GET /roles", self.op_list_roles),
+                (15, "POST /applications", self.op_create_app),
+                (15, "PUT /applications/{app_id}", self.op_update_app),
+                (10, "POST /users", self.op_create_user),
+            ],
+            "sync": [
+                (50, "GET /defectdojo/users", self.op_dojo_users),
+                (50, "POST /defectdojo/sync-roles", self.op_sync_roles),
+            ],
+        }
+        mixes["mixed"] = (
+            [(w * 7, n, op) for w, n, op in mixes["launcher"]]
+            + [(w * 2, n, op) for w, n, op in mixes["admin"]]
+            + [(w, n, op) for w, n, op in mixes["sync"]]
+        )
+        if name not in mixes:
+            raise SystemExit(f"Unknown mix {name!r}; choose from {sorted(mixes)}")
+        return mixes[name]
+
+
+class BenchmarkRunner:
+    """Drive a workload mix at fixed concurrency and collect per-endpoint latencies"""
+
+    def __init__(self, workload: Workload, mix_name: str, concurrency: int, duration: float,
+                 warmup: float, seed: int):
+        self.workload = workload
+        self.mix = workload.mix(mix_name)
+        self.concurrency = concurrency
+        self.duration = duration
+        self.warmup = warmup
+        self.seed = seed
+        self.samples = {name: [] for _, name, _ in self.mix}
+        self.errors = {name: 0 for _, name, _ in self.mix}
+
+    def _worker(self, index: int, deadline: float, record_after: float):
+        rng = random.Random(self.seed * 1000 + index)
+        weights = [weight for weight, _, _ in self.mix]
+        session = requests.Session()
+        samples = {name: [] for _, name, _ in self.mix}
+        errors = {name: 0 for _, name, _ in self.mix}
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            _, name, op = rng.choices(self.mix, weights=weights)[0]
+            method, path, headers, body = op(rng)
+            start = time.perf_counter()
+            try:
+                response = session.request(method, f"{self.workload.api_url}{path}",
+                                            headers=headers, json=body, timeout=30)
+                failed = response.status_code >= 400
+            except requests.RequestException:
+                failed = True
+            elapsed = time.perf_counter() - start
+            if start >= record_after:
+                samples[name].append(elapsed)
+                if failed:
+                    errors[name] += 1
+        return samples, errors
+
+    def run(self) -> dict:
+        start = time.perf_counter()
+        record_after = start + self.warmup
+        deadline = record_after + self.duration
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            results = list(pool.map(lambda i: self._worker(i, deadline, record_after), range(self.concurrency)))
+        for samples, errors in results:
+            for name in samples:
+                self.samples[name].extend(samples[name])
+                self.errors[name] += errors[name]
+        return self.report()
+
+    def _summarize(self, latencies, errors: int) -> dict:
+        latencies = sorted(latencies)
+        count = len(latencies)
+        return {
+            "count": count,
+            "errors": errors,
+            "rps": round(count / self.duration, 2),
+            "mean_ms": round(1000 * sum(latencies) / count, 3) if count else 0.0,
+            "p50_ms": round(1000 * percentile(latencies, 50), 3),
+            "p95_ms": round(1000 * percentile(latencies, 95), 3),
+            "p99_ms": round(1000 * percentile(latencies, 99), 3),
+        }
+
+    def report(self) -> dict:
+        endpoints = {name: self._summarize(self.samples[name], self.errors[name]) for name in self.samples}
+        all_latencies = [value for values in self.samples.values() for value in values]
+        return {
+            "endpoints": endpoints,
+            "total": self._summarize(all_latencies, sum(self.errors.values())),
+        }
+
+
+def server_env(args) -> dict:
+    return {"STARTUP_MODE": args.startup_mode, "ADMISSION_CONTROL": "1" if args.admission_control else "0"}
+
+
+def measure_cold_start(args, dojo_url: str) -> dict:
+    """Spawn fresh servers and time import, first response and readiness"""
+    env = dict(os.environ, MONGO_URL=args.mongo_url, DB_NAME="bench_cold_start",
+               DEFECTDOJO_URL=dojo_url, STARTUP_MODE=args.startup_mode)
+    imports, first_responses, readiness = [], [], []
+    for _ in range(args.cold_start):
+        output = subprocess.check_output([sys.executable, "-c", IMPORT_PROBE], cwd=BACKEND_DIR, env=env, text=True)
+        imports.append(float(output.strip().splitlines()[-1]))
+
+        server = ConsoleServer(args.mongo_url, "bench_cold_start", dojo_url, args.in_memory,
+                               extra_env=server_env(args), quiet=not args.server_logs)
+        server.start()
+        try:
+            first_responses.append(server.wait_ready("/api/health"))
+            readiness.append(server.wait_ready("/api/ready"))
+        finally:
+            server.stop()
+
+    def summarize(values):
+        values = sorted(values)
+        return {
+            "p50_ms": round(1000 * percentile(values, 50), 1),
+            "max_ms": round(1000 * values[-1], 1),
+            "samples_ms": [round(1000 * v, 1) for v in values],
+        }
+
+    return {
+        "cold_start": {
+            "import": summarize(imports),
+            "first_response": summarize(first_responses),
+            "ready": summarize(readiness),
+        }
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float) -> int:
+    """Print per-endpoint deltas; return the number of regressions beyond threshold"""
+    regressions = 0
+    print(f"\n📊 Comparison against baseline {baseline['meta'].get('git_revision')} (threshold {threshold:.0%}):")
+    for name, stats in current["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if not before or not before["count"] or not stats["count"]:
+            continue
+        rps_delta = (stats["rps"] - before["rps"]) / before["rps"] if before["rps"] else 0.0
+        p95_delta = (stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        regressed = p95_delta > threshold or rps_delta < -threshold
+        regressions += regressed
+        marker = "❌" if regressed else "✅"
+        print(f"  {marker} {name}: rps {before['rps']} -> {stats['rps']} ({rps_delta:+.1%}), "
+              f"p95 {before['p95_ms']}ms -> {stats['p95_ms']}ms ({p95_delta:+.1%})")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Unified Security Console benchmark suite")
+    parser.add_argument("--mix", default="mixed", help="launcher, admin, sync or mixed")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before recording")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--applications", type=int, default=200, help="Applications seeded before the run")
+    parser.add_argument("--users", type=int, default=50, help="Users seeded before the run")
+    parser.add_argument("--mongo-url", default=os.environ.get("BENCH_MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--in-memory", action="store_true", help="Use mongomock_motor instead of MongoDB")
+    parser.add_argument("--dojo-latency", type=float, default=0.02, help="Fake DefectDojo base latency (s)")
+    parser.add_argument("--dojo-jitter", type=float, default=0.01, help="Fake DefectDojo added random latency (s)")
+    parser.add_argument("--dojo-error-rate", type=float, default=0.0, help="Fraction of fake DefectDojo 500s")
+    parser.add_argument("--cold-start", type=int, default=0, metavar="N",
+                        help="Measure N cold starts instead of running a load mix")
+    parser.add_argument("--startup-mode", default="lazy", help="STARTUP_MODE for the server (lazy or eager)")
+    parser.add_argument("--server-logs", action="store_true", help="Show the console server's own output")
+    parser.add_argument("--admission-control", action="store_true",
+                        help="Leave the server's admission control enabled during seeding and the run")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--regression-threshold", type=float, default=0.10)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db_name = f"bench_{uuid.uuid4().hex[:8]}"
+
+    dojo = FakeDefectDojo(args.dojo_latency, args.dojo_jitter, args.dojo_error_rate, seed=args.seed)
+    dojo.start()
+    if args.cold_start:
+        try:
+            report = measure_cold_start(args, dojo.url)
+        finally:
+            dojo.stop()
+        report["meta"] = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_revision": git_revision(),
+            "startup_mode": args.startup_mode,
+            "in_memory": args.in_memory,
+            "runs": args.cold_start,
+        }
+        print(json.dumps(report, indent=2))
+        return 0
+
+    server = ConsoleServer(args.mongo_url, db_name, dojo.url, args.in_memory,
+                           extra_env=server_env(args), quiet=not args.server_logs)
+    server.start()
+    try:
+        ready_seconds = server.wait_ready()
+        print(f"🚀 Server ready in {ready_seconds:.3f}s at {server.url}", file=sys.stderr)
+
+        workload = Workload(server.url, args.seed)
+        workload.seed(args.applications, args.users)
+        print(f"📋 Seeded {args.applications} applications and {args.users} users; "
+              f"running '{args.mix}' at concurrency {args.concurrency} for {args.duration}s", file=sys.stderr)
+
+        runner = BenchmarkRunner(workload, args.mix, args.concurrency, args.duration, args.warmup, args.seed)
+        report = runner.run()
+    finally:
+        server.stop()
+        dojo.stop()
+        if not args.in_memory:
+            try:
+                from pymongo import MongoClient
+                MongoClient(args.mongo_url).drop_database(db_name)
+            except Exception as e:
+                print(f"⚠️  Could not drop benchmark database {db_name}: {e}", file=sys.stderr)
+
+    report["meta"] = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "git_revision": git_revision(),
+        "mix": args.mix,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "applications": args.applications,
+        "users": args.users,
+        "in_memory": args.in_memory,
+        "admission_control": args.admission_control,
+        "dojo_latency": args.dojo_latency,
+        "dojo_jitter": args.dojo_jitter,
+        "dojo_error_rate": args.dojo_error_rate,
+        "server_ready_seconds": round(ready_seconds, 4),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        return 1 if compare_reports(baseline, report, args.regression_threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -303,6 +303,59 @@ class UnifiedSecurityConsoleAPITester:
 
         return get_success and post_success
 
+    def test_conditional_writes(self):
+        """Test If-Match handling on role PUT/DELETE"""
+        test_role = {
+            "name": f"VersionedRole_{datetime.now().strftime('%H%M%S')}",
+            "description": "Test role for optimistic concurrency",
+            "permissions": ["read"]
+        }
+        try:
+            response = requests.post(f"{self.api_url}/roles", json=test_role, headers=self.headers, timeout=10)
+            role_id = response.json().get('id') if response.status_code == 200 else None
+            self.log_test("Create Versioned Role", role_id is not None, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_test("Create Versioned Role", False, str(e))
+            return False
+        if not role_id:
+            return False
+
+        results = []
+        checks = [
+            ("Update With Current If-Match", "put", role_id, '"0"', 200),
+            ("Update With Stale If-Match", "put", role_id, '"0"', 409),
+            ("Delete With Stale If-Match", "delete", role_id, '"0"', 409),
+            ("Update Missing Role With If-Match", "put", "missing-role-id", '"0"', 404),
+        ]
+        etag = None
+        for name, method, target_id, if_match, expected_status in checks:
+            try:
+                response = requests.request(
+                    method.upper(), f"{self.api_url}/roles/{target_id}",
+                    json={"description": "Updated by conditional write test"} if method == "put" else None,
+                    headers={**self.headers, 'If-Match': if_match}, timeout=10
+                )
+                success = response.status_code == expected_status
+                if success and expected_status == 200:
+                    etag = response.headers.get('ETag')
+                    success = etag == '"1"'
+                self.log_test(name, success, f"Status: {response.status_code}, ETag: {response.headers.get('ETag')}")
+            except Exception as e:
+                self.log_test(name, False, str(e))
+                success = False
+            results.append(success)
+
+        try:
+            response = requests.delete(f"{self.api_url}/roles/{role_id}",
+                                       headers={**self.headers, 'If-Match': etag or '"1"'}, timeout=10)
+            delete_success = response.status_code == 200
+            self.log_test("Delete With Current If-Match", delete_success, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_test("Delete With Current If-Match", False, str(e))
+            delete_success = False
+
+        return all(results) and delete_success
+
     def test_defectdojo_integration(self):
         """Test DefectDojo API integration"""
         # Test GET DefectDojo users
@@ -394,6 +447,7 @@ class UnifiedSecurityConsoleAPITester:
         self.test_applications_crud()
         self.test_users_crud()
         self.test_roles_crud()
+        self.test_conditional_writes()
         
         # Test module-specific endpoints
         print("\n🔧 Module-Specific Tests:")
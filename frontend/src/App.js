@@ -87,7 +87,7 @@ const ModuleCard = ({ module, applications, onAppClick }) => {
 };
 
 const Dashboard = () => {
-  const [applications, setApplications] = useState([]);
+  const [groupedApps, setGroupedApps] = useState({});
   const [stats, setStats] = useState({});
   const [loading, setLoading] = useState(true);
 
@@ -98,8 +98,8 @@ const Dashboard = () => {
 
   const fetchApplications = async () => {
     try {
-      const response = await axios.get(`${API}/applications`);
-      setApplications(response.data);
+      const response = await axios.get(`${API}/applications/visible`);
+      setGroupedApps(response.data.modules);
     } catch (error) {
       console.error('Error fetching applications:', error);
     } finally {
@@ -116,22 +116,30 @@ const Dashboard = () => {
     }
   };
 
-  const handleAppClick = (app) => {
+  const handleAppClick = async (app) => {
     if (app.redirect_url) {
-      window.open(app.redirect_url, '_blank');
+      // Open synchronously so popup blockers allow it, then navigate once the ticket arrives.
+      // window.open returns null when the popup is blocked anyway; launch in this tab then.
+      const launchWindow = window.open('', '_blank');
+      try {
+        const response = await axios.post(`${API}/launch/${app.id}/ticket`);
+        const launchUrl = `${API}/launch/${app.id}?ticket=${encodeURIComponent(response.data.ticket)}`;
+        if (launchWindow) {
+          launchWindow.location = launchUrl;
+        } else {
+          window.location.assign(launchUrl);
+        }
+      } catch (error) {
+        if (launchWindow) {
+          launchWindow.close();
+        }
+        console.error('Error launching application:', error);
+      }
     } else {
       alert('No redirect URL configured for this application');
     }
   };
 
-  const groupedApps = applications.reduce((acc, app) => {
-    if (!acc[app.module]) {
-      acc[app.module] = [];
-    }
-    acc[app.module].push(app);
-    return acc;
-  }, {});
-
   if (loading) {
     return (
       <div className="flex items-center justify-center h-64">
@@ -173,7 +181,7 @@ const Dashboard = () => {
         <h2 className="text-2xl font-bold mb-6 text-center">Security Modules</h2>
         
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-4">
-          {['XDR', 'XDR+', 'OXDR', 'GSOS'].map((module) => (
+          {Object.keys(groupedApps).map((module) => (
             <ModuleCard
               key={module}
               module={module}
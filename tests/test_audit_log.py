@@ -0,0 +1,105 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from bson import ObjectId
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+class FakeAuditCollection:
+    """insert_many stand-in that assigns _id in place like pymongo and can fail selected documents"""
+
+    def __init__(self):
+        self.stored = {}
+        self.fail_actions = set()
+        self.transient_actions = set()
+        self.fail_connection = False
+
+    async def insert_many(self, documents, ordered=True):
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+        if self.fail_connection:
+            raise AutoReconnect("connection reset")
+        errors = []
+        for index, document in enumerate(documents):
+            if document["_id"] in self.stored:
+                errors.append({"index": index, "code": 11000, "errmsg": "E11000 duplicate key error"})
+            elif document["action"] in self.fail_actions:
+                errors.append({"index": index, "code": 121, "errmsg": "Document failed validation"})
+            elif document["action"] in self.transient_actions:
+                errors.append({"index": index, "code": 91, "errmsg": "The server is in quiesce mode"})
+            else:
+                self.stored[document["_id"]] = dict(document)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(documents) - len(errors)})
+
+
+class AuditLogFlushTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.collection = FakeAuditCollection()
+        patcher = mock.patch.object(server, "db", mock.Mock(audit_log=self.collection))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_partial_failure_requeues_only_failed_events(self):
+        audit_log = server.AuditLog(batch_size=10, flush_interval=1.0, max_buffer=100)
+        for action in ("create", "update", "retry", "delete"):
+            audit_log.record("admin", action, "application")
+        self.collection.transient_actions = {"retry"}
+
+        await audit_log.flush()
+        self.assertEqual([event["action"] for event in audit_log._buffer], ["retry"])
+        self.assertNotIn("_id", audit_log._buffer[0])
+
+        self.collection.transient_actions = set()
+        audit_log.record("admin", "launch", "application")
+        await audit_log.flush()
+        self.assertEqual(len(audit_log._buffer), 0)
+        self.assertEqual(len(self.collection.stored), 5)
+
+    async def test_rejected_events_are_dropped_and_flush_continues(self):
+        audit_log = server.AuditLog(batch_size=2, flush_interval=1.0, max_buffer=100)
+        for action in ("reject", "create", "update", "delete", "launch"):
+            audit_log.record("admin", action, "application")
+        self.collection.fail_actions = {"reject"}
+        dropped = server.AUDIT_EVENTS_DROPPED.value()
+
+        await audit_log.flush()
+        self.assertEqual(len(audit_log._buffer), 0)
+        self.assertEqual(sorted(event["action"] for event in self.collection.stored.values()),
+                         ["create", "delete", "launch", "update"])
+        self.assertEqual(server.AUDIT_EVENTS_DROPPED.value(), dropped + 1)
+
+    async def test_connection_failure_retry_does_not_duplicate(self):
+        audit_log = server.AuditLog(batch_size=10, flush_interval=1.0, max_buffer=100)
+        audit_log.record("admin", "create", "application")
+        self.collection.fail_connection = True
+        await audit_log.flush()
+        self.assertEqual(len(audit_log._buffer), 1)
+
+        # Pretend the first attempt reached the server before the connection dropped
+        event = audit_log._buffer[0]
+        self.collection.stored[event["_id"]] = dict(event)
+        self.collection.fail_connection = False
+        await audit_log.flush()
+        self.assertEqual(len(audit_log._buffer), 0)
+        self.assertEqual(len(self.collection.stored), 1)
+
+    async def test_requeue_into_full_buffer_drops_oldest(self):
+        audit_log = server.AuditLog(batch_size=2, flush_interval=1.0, max_buffer=4)
+        for index in range(3):
+            audit_log.record("admin", f"old-{index}", "application")
+        batch = [audit_log._buffer.popleft() for _ in range(2)]
+        audit_log.record("admin", "new-0", "application")
+        audit_log.record("admin", "new-1", "application")
+        audit_log._requeue(batch)
+        self.assertEqual([event["action"] for event in audit_log._buffer], ["old-1", "old-2", "new-0", "new-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import collections
+import random
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi import HTTPException
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+try:
+    from mongomock_motor import AsyncMongoMockClient
+except ImportError:  # pragma: no cover - optional, as for the benchmark's --in-memory mode
+    AsyncMongoMockClient = None
+
+PAGE_SIZE = 5
+FIELD = server.FINDINGS_CHANGED_FIELD
+
+
+def stamp(second):
+    return f"2026-01-01T00:{second // 60:02d}:{second % 60:02d}Z"
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeFindingsApi:
+    """defectdojo_request stand-in filtering and ordering findings like DefectDojo's list endpoint"""
+
+    def __init__(self):
+        self.findings = {}
+        self.requests = 0
+        self.before_page = None
+
+    def add(self, finding_id, changed, severity="High"):
+        self.findings[finding_id] = {"id": finding_id, "severity": severity, "active": True, FIELD: changed}
+
+    async def request(self, operation, method, path, params):
+        self.requests += 1
+        if self.before_page is not None:
+            self.before_page(self.requests)
+        rows = list(self.findings.values())
+        if params.get(server.FINDINGS_CHANGED_ISNULL_PARAM) == "true":
+            rows = sorted((f for f in rows if f[FIELD] is None), key=lambda f: f["id"])
+        else:
+            since = params.get(server.FINDINGS_CHANGED_SINCE_PARAM, "")
+            rows = sorted((f for f in rows if f[FIELD] is not None and f[FIELD] >= since),
+                          key=lambda f: (f[FIELD], f["id"]))
+        after = params.get(server.FINDINGS_ID_AFTER_PARAM)
+        if after is not None:
+            rows = [f for f in rows if f["id"] > after]
+        offset, limit = params["offset"], params["limit"]
+        return FakeResponse({"results": [dict(f) for f in rows[offset:offset + limit]]})
+
+
+@unittest.skipIf(AsyncMongoMockClient is None, "mongomock_motor is not installed")
+class FindingsMirrorSyncTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.db = AsyncMongoMockClient()["findings_sync_test"]
+        self.api = FakeFindingsApi()
+        self.mirror = server.FindingsMirror()
+        for target, value in ((server, "db"), (server, "defectdojo_request")):
+            patcher = mock.patch.object(target, value, self.db if value == "db" else self.api.request)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(server, "FINDINGS_PAGE_SIZE", PAGE_SIZE)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def assert_mirror_matches_upstream(self):
+        stored = {doc["id"]: doc async for doc in self.db.findings.find({}, {"_id": 0})}
+        self.assertEqual(sorted(stored), sorted(self.api.findings))
+        for finding_id, finding in self.api.findings.items():
+            self.assertEqual(stored[finding_id]["changed_at"], finding[FIELD], finding_id)
+            self.assertEqual(stored[finding_id]["severity"], finding["severity"], finding_id)
+        await self.assert_rollups_consistent()
+
+    async def assert_rollups_consistent(self):
+        expected = collections.Counter()
+        async for doc in self.db.findings.find({}, {"_id": 0}):
+            for dimension, value, _ in server.finding_buckets(doc):
+                expected[f"{dimension}:{value}"] += 1
+        rollups = {doc["_id"]: doc["count"] async for doc in self.db.findings_rollups.find({"count": {"$ne": 0}})}
+        self.assertEqual(rollups, dict(expected))
+
+    async def test_tie_longer_than_a_page(self):
+        for finding_id in range(1, 4):
+            self.api.add(finding_id, stamp(1))
+        for finding_id in range(4, 21):
+            self.api.add(finding_id, stamp(2))
+        self.api.add(21, stamp(3))
+
+        summary = await self.mirror.sync()
+        self.assertEqual(summary["mirrored"], 21)
+        self.assertEqual(summary["high_water_mark"], stamp(3))
+        await self.assert_mirror_matches_upstream()
+
+        # A second tie on the stored mark, longer than a page, behind the stored id
+        for finding_id in range(22, 34):
+            self.api.add(finding_id, stamp(3))
+        summary = await self.mirror.sync()
+        self.assertEqual(summary["mirrored"], 12)
+        await self.assert_mirror_matches_upstream()
+
+        summary = await self.mirror.sync()
+        self.assertEqual(summary["mirrored"], 0)
+
+    async def test_tie_shifting_while_stepped_through(self):
+        for finding_id in range(1, 18):
+            self.api.add(finding_id, stamp(2))
+
+        def leave_tie(request_number):
+            # Rows already read leave the tie, shifting the offsets of the rest down
+            if request_number in (2, 3):
+                for finding_id in (request_number, request_number + 1):
+                    self.api.findings[finding_id][FIELD] = stamp(5)
+
+        self.api.before_page = leave_tie
+        await self.mirror.sync()
+        await self.assert_mirror_matches_upstream()
+
+    async def test_rows_changing_mid_run_are_not_skipped(self):
+        rng = random.Random(7)
+        for finding_id in range(1, 61):
+            self.api.add(finding_id, stamp(rng.randrange(4)))
+        now = 4
+
+        def churn(request_number):
+            # Changed values only move forward, and often tie with the newest one
+            nonlocal now
+            if request_number > 12:
+                return
+            now += rng.randrange(2)
+            for finding_id in rng.sample(sorted(self.api.findings), 3):
+                self.api.findings[finding_id][FIELD] = stamp(now)
+                self.api.findings[finding_id]["severity"] = rng.choice(server.SEVERITY_ORDER)
+            self.api.add(len(self.api.findings) + 1, stamp(now))
+
+        self.api.before_page = churn
+        await self.mirror.sync()
+        await self.assert_mirror_matches_upstream()
+
+    async def test_findings_without_changed_value_are_mirrored_by_id(self):
+        for finding_id in range(1, 24):
+            self.api.add(finding_id, None if finding_id % 2 else stamp(finding_id))
+
+        summary = await self.mirror.sync()
+        self.assertEqual(summary["mirrored"], 23)
+        await self.assert_mirror_matches_upstream()
+
+        self.api.add(30, None)
+        self.api.findings[1][FIELD] = stamp(40)
+        summary = await self.mirror.sync()
+        self.assertEqual(summary["mirrored"], 2)
+        await self.assert_mirror_matches_upstream()
+
+    async def test_lease_loss_aborts_without_corrupting_rollups(self):
+        for finding_id in range(1, 21):
+            self.api.add(finding_id, stamp(finding_id))
+
+        def steal_lease(request_number):
+            if request_number == 3:
+                self.mirror.owner = "another-worker"
+
+        self.api.before_page = steal_lease
+        with self.assertRaises(HTTPException) as raised:
+            await self.mirror.sync()
+        self.assertEqual(raised.exception.status_code, 409)
+
+        # Pages stored before the loss are kept and the mark covers exactly them
+        stored = sorted([doc["id"] async for doc in self.db.findings.find({}, {"id": 1})])
+        state = await self.db.sync_state.find_one({"_id": server.FINDINGS_STATE_ID})
+        self.assertEqual(stored, list(range(1, state["high_water_id"] + 1)))
+        self.assertLess(len(stored), len(self.api.findings))
+        await self.assert_rollups_consistent()
+
+
+if __name__ == "__main__":
+    unittest.main()
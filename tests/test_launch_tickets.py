@@ -0,0 +1,69 @@
+import base64
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+ANALYST = {"username": "analyst", "is_admin": False}
+
+
+class LaunchTicketTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(server._redeemed_launch_tickets, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_valid_ticket_redeems_to_its_user(self):
+        ticket = server.issue_launch_ticket("app-1", ANALYST)
+        self.assertEqual(server.redeem_launch_ticket(ticket, "app-1"), ANALYST)
+
+    def test_ticket_is_single_use(self):
+        ticket = server.issue_launch_ticket("app-1", ANALYST)
+        self.assertIsNotNone(server.redeem_launch_ticket(ticket, "app-1"))
+        self.assertIsNone(server.redeem_launch_ticket(ticket, "app-1"))
+
+    def test_ticket_is_bound_to_its_app(self):
+        ticket = server.issue_launch_ticket("app-1", ANALYST)
+        self.assertIsNone(server.redeem_launch_ticket(ticket, "app-2"))
+        # A rejected attempt does not burn the ticket for the right app
+        self.assertEqual(server.redeem_launch_ticket(ticket, "app-1"), ANALYST)
+
+    def test_expired_ticket_is_rejected(self):
+        with mock.patch.object(server.time, "time", return_value=1_000_000):
+            ticket = server.issue_launch_ticket("app-1", ANALYST)
+        with mock.patch.object(server.time, "time", return_value=1_000_000 + server.LAUNCH_TICKET_TTL_SECONDS + 1):
+            self.assertIsNone(server.redeem_launch_ticket(ticket, "app-1"))
+
+    def test_tampered_claims_are_rejected(self):
+        ticket = server.issue_launch_ticket("app-1", ANALYST)
+        payload, signature = ticket.split(".")
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        claims["is_admin"] = True
+        forged = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+        self.assertIsNone(server.redeem_launch_ticket(f"{forged}.{signature}", "app-1"))
+
+    def test_tampered_signature_is_rejected(self):
+        payload, signature = server.issue_launch_ticket("app-1", ANALYST).split(".")
+        flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+        self.assertIsNone(server.redeem_launch_ticket(f"{payload}.{flipped}", "app-1"))
+
+    def test_malformed_tickets_are_rejected(self):
+        for ticket in ("", ".", "no-signature", "a.b.c", "é.é", "\udcff.x", "%%%.%%%"):
+            with self.subTest(ticket=ticket):
+                self.assertIsNone(server.redeem_launch_ticket(ticket, "app-1"))
+
+    def test_expired_nonces_are_pruned(self):
+        with mock.patch.object(server.time, "time", return_value=1_000_000):
+            server.redeem_launch_ticket(server.issue_launch_ticket("app-1", ANALYST), "app-1")
+        self.assertEqual(len(server._redeemed_launch_tickets), 1)
+        server.redeem_launch_ticket(server.issue_launch_ticket("app-1", ANALYST), "app-1")
+        self.assertEqual(len(server._redeemed_launch_tickets), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+try:
+    from mongomock_motor import AsyncMongoMockClient
+except ImportError:  # pragma: no cover - optional, as for the benchmark's --in-memory mode
+    AsyncMongoMockClient = None
+
+ADMIN = {"Authorization": "Bearer admin-token"}
+
+
+@unittest.skipIf(AsyncMongoMockClient is None, "mongomock_motor is not installed")
+class PartialUpdateNullTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(server, "db", AsyncMongoMockClient()["partial_update_test"])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(server.app)
+
+    def create(self, path, body):
+        response = self.client.post(f"/api/{path}", json=body, headers=ADMIN)
+        self.assertEqual(response.status_code, 200, response.text)
+        return response.json()["id"]
+
+    def assert_null_rejected(self, path, entity_id, field):
+        response = self.client.put(f"/api/{path}/{entity_id}", json={field: None}, headers=ADMIN)
+        self.assertEqual(response.status_code, 422, response.text)
+        self.assertIn(field, response.json()["detail"])
+        listing = self.client.get(f"/api/{path}", headers=ADMIN)
+        self.assertEqual(listing.status_code, 200, listing.text)
+        stored = next(item for item in listing.json() if item["id"] == entity_id)
+        self.assertIsNotNone(stored[field])
+        self.assertEqual(stored["version"], 0)
+
+    def test_null_for_required_user_field_is_rejected(self):
+        user_id = self.create("users", {"username": "analyst", "email": "analyst@example.com", "module_access": ["XDR"]})
+        self.assert_null_rejected("users", user_id, "module_access")
+        self.assert_null_rejected("users", user_id, "email")
+
+    def test_null_for_required_role_field_is_rejected(self):
+        role_id = self.create("roles", {"name": "Responder", "permissions": ["read"]})
+        self.assert_null_rejected("roles", role_id, "permissions")
+
+    def test_null_for_required_application_field_is_rejected(self):
+        app_id = self.create("applications", {
+            "app_name": "Wazuh", "app_type": "Wazuh", "module": "XDR", "redirect_url": "https://wazuh.example.com"
+        })
+        self.assert_null_rejected("applications", app_id, "redirect_url")
+
+    def test_null_clears_optional_field(self):
+        user_id = self.create("users", {"username": "analyst", "email": "analyst@example.com", "first_name": "Ana"})
+        response = self.client.put(f"/api/users/{user_id}", json={"first_name": None}, headers=ADMIN)
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertIsNone(response.json()["first_name"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+def application(app_id, name, module="siem", description=""):
+    return {"id": app_id, "app_name": name, "module": module, "description": description}
+
+
+class FakeCursor:
+    def __init__(self, docs, on_read=None):
+        self._docs = list(docs)
+        self._on_read = on_read
+
+    async def to_list(self, length):
+        if self._on_read is not None:
+            self._on_read()
+            self._on_read = None
+        chunk, self._docs = self._docs[:length], self._docs[length:]
+        return chunk
+
+
+class FakeDatabase:
+    """db[collection].find() stand-in returning a fixed snapshot per collection"""
+
+    def __init__(self, collections, on_read=None):
+        self._collections = collections
+        self._on_read = on_read or {}
+
+    def __getitem__(self, name):
+        return mock.Mock(find=lambda *args: FakeCursor(self._collections.get(name, []), self._on_read.get(name)))
+
+
+class SearchIndexTest(unittest.TestCase):
+    def test_module_change_moves_document_between_partitions(self):
+        index = server.SearchIndex()
+        index.upsert("application", application("a1", "Wazuh Manager", module="siem"))
+        index.upsert("application", application("a1", "Wazuh Manager", module="edr"))
+
+        self.assertEqual(index.search("wazuh", {"application"}, {"siem"}, 10), [])
+        self.assertEqual([r["id"] for r in index.search("wazuh", {"application"}, {"edr"}, 10)], ["a1"])
+        self.assertEqual(index.autocomplete("waz", {"application"}, {"siem"}, 10), [])
+        siem = index._partitions[server.search_partition("application", "siem")]
+        self.assertEqual((siem.postings, siem.tokens, siem.titles), ({}, [], []))
+
+    def test_non_admin_modules_limit_applications_only(self):
+        index = server.SearchIndex()
+        index.upsert("application", application("a1", "Alpha Console", module="siem"))
+        index.upsert("application", application("a2", "Alpha Scanner", module="vm"))
+        index.upsert("role", {"id": "r1", "name": "alpha-role", "description": ""})
+
+        results = index.search("alpha", {"application", "role"}, {"siem"}, 10)
+        self.assertEqual(sorted(r["id"] for r in results), ["a1", "r1"])
+        self.assertEqual(len(index.search("alpha", {"application", "role"}, None, 10)), 3)
+
+    def test_candidate_cap_bounds_single_term_results(self):
+        index = server.SearchIndex()
+        index.bulk_load("application", [application(f"a{i}", f"Sensor {i}") for i in range(20)])
+        with mock.patch.object(server, "SEARCH_MAX_CANDIDATES", 5):
+            self.assertEqual(len(index.search("sensor", {"application"}, None, 50)), 5)
+        self.assertEqual(len(index.search("sensor", {"application"}, None, 50)), 20)
+
+    def test_candidate_cap_can_miss_documents_matching_two_common_terms(self):
+        # Known tradeoff: candidates come from the most selective term only
+        index = server.SearchIndex()
+        docs = [application(f"alpha{i}", f"Alpha {i}") for i in range(10)]
+        docs += [application(f"beta{i}", f"Beta {i}") for i in range(10)]
+        docs.append(application("both", "Alpha Beta"))
+        index.bulk_load("application", docs)
+
+        with mock.patch.object(server, "SEARCH_MAX_CANDIDATES", 5):
+            self.assertEqual(index.search("alpha beta", {"application"}, None, 10), [])
+        self.assertEqual([r["id"] for r in index.search("alpha beta", {"application"}, None, 10)], ["both"])
+
+
+class SearchServiceRebuildTest(unittest.IsolatedAsyncioTestCase):
+    async def test_rebuild_replays_writes_made_while_reading(self):
+        service = server.SearchService(rebuild_interval=300)
+        snapshot = {
+            "applications": [application("a1", "Old Console")],
+            "roles": [{"id": "r1", "name": "Auditor", "description": ""}]
+        }
+
+        def write_during_rebuild():
+            # Lands after the applications snapshot was read, so only the replay can apply it
+            service.upsert("application", application("a2", "New Console"))
+            service.remove("role", "r1")
+
+        fake_db = FakeDatabase(snapshot, on_read={"users": write_during_rebuild})
+        with mock.patch.object(server, "db", fake_db):
+            index = await service.get_index()
+
+        self.assertEqual(sorted(r["id"] for r in index.search("console", {"application"}, None, 10)), ["a1", "a2"])
+        self.assertEqual(index.search("auditor", {"role"}, None, 10), [])
+        self.assertIsNone(service._pending)
+
+    async def test_invalidate_triggers_background_rebuild(self):
+        service = server.SearchService(rebuild_interval=300)
+        snapshot = {"applications": [application("a1", "Old Console")]}
+        with mock.patch.object(server, "db", FakeDatabase(snapshot)):
+            await service.get_index()
+            snapshot["applications"].append(application("a2", "Imported Console"))
+            service.invalidate()
+            await service.get_index()
+            await service._rebuild_task
+
+        self.assertEqual(len(service.index), 2)
+        self.assertFalse(service._stale)
+
+
+if __name__ == "__main__":
+    unittest.main()